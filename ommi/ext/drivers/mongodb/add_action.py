@@ -2,18 +2,30 @@ from contextlib import suppress
 
 from typing import Iterable
 
+from pymongo.client_session import ClientSession
+
 from ommi.drivers.add_actions import AddAction
 from ommi.drivers.database_results import async_result
 from ommi.drivers.driver_types import TModel
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
-from ommi.ext.drivers.mongodb.utils import model_to_dict
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.utils import get_collection, model_to_dict
 from ommi.models import OmmiModel
+from ommi.models.field_metadata import FieldMetadata
 
 
 class MongoDBAddAction(AddAction[MongoDBConnection, OmmiModel]):
-    def __init__(self, connection: MongoDBConnection, database):
+    def __init__(
+        self,
+        connection: MongoDBConnection,
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
+    ):
         super().__init__(connection)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
 
     @async_result
     async def items(self, *items: TModel) -> Iterable[TModel]:
@@ -23,29 +35,40 @@ class MongoDBAddAction(AddAction[MongoDBConnection, OmmiModel]):
         return items
 
     async def _insert(self, item: OmmiModel):
+        if self._read_cache:
+            self._read_cache.invalidate(item.__ommi__.model_name)
+
+        if self._session:
+            # $merge isn't allowed in a transaction so the next id is looked up and written with the document instead
+            await self._set_next_pk(item)
+
         data = model_to_dict(item)
-        result = await self._db[item.__ommi__.model_name].insert_one(data)
+        result = await get_collection(self._db, item.__ommi__.model_name).insert_one(
+            data, session=self._session
+        )
         item.__ommi_mongodb_id__ = result.inserted_id
         await self._set_auto_increment_pk(item)
 
-    async def _set_auto_increment_pk(self, item: OmmiModel):
-        pks = item.get_primary_key_fields()
-        if len(pks) != 1:
+    async def _set_next_pk(self, item: OmmiModel):
+        if (pk := self._get_auto_increment_pk(item)) is None:
             return
 
-        pk = pks[0]
-        if getattr(item, pk.get("field_name")) is not None:
-            return
+        name = pk.get("store_as")
+        result = await get_collection(self._db, item.__ommi__.model_name).find_one(
+            {name: {"$ne": None}},
+            {"_id": 0, name: 1},
+            sort=[(name, -1)],
+            session=self._session,
+        )
+        setattr(item, pk.get("field_name"), result[name] + 1 if result else 0)
 
-        if (
-            not issubclass(pk.get("field_type"), int)
-            or getattr(item, pk.get("field_name")) is not None
-        ):
+    async def _set_auto_increment_pk(self, item: OmmiModel):
+        if (pk := self._get_auto_increment_pk(item)) is None:
             return
 
         name = pk.get("store_as")
         with suppress(StopAsyncIteration):
-            await self._db[item.__ommi__.model_name].aggregate(
+            await get_collection(self._db, item.__ommi__.model_name).aggregate(
                 [
                     {
                         "$lookup": {
@@ -108,10 +131,27 @@ class MongoDBAddAction(AddAction[MongoDBConnection, OmmiModel]):
                     {
                         "$merge": item.__ommi__.model_name,
                     },
-                ]
+                ],
+                session=self._session,
             ).next()
 
-        result = await self._db[item.__ommi__.model_name].find_one(
-            {"_id": item.__ommi_mongodb_id__}, {"_id": 0, name: 1}
+        result = await get_collection(self._db, item.__ommi__.model_name).find_one(
+            {"_id": item.__ommi_mongodb_id__},
+            {"_id": 0, name: 1},
+            session=self._session,
         )
         setattr(item, pk.get("field_name"), result[name])
+
+    def _get_auto_increment_pk(self, item: OmmiModel) -> FieldMetadata | None:
+        pks = item.get_primary_key_fields()
+        if len(pks) != 1:
+            return None
+
+        pk = pks[0]
+        if (
+            not issubclass(pk.get("field_type"), int)
+            or getattr(item, pk.get("field_name")) is not None
+        ):
+            return None
+
+        return pk
@@ -1,29 +1,60 @@
 from typing import TypeAlias, Type, Sequence
 
+from pymongo.client_session import ClientSession
+
 from ommi.drivers.count_actions import CountAction
 from ommi.drivers.database_results import async_result
 from ommi.drivers.driver_types import TModel
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
-from ommi.ext.drivers.mongodb.utils import build_pipeline, process_ast
+from ommi.ext.drivers.mongodb.utils import (
+    build_find_arguments,
+    build_pipeline,
+    get_collection,
+    process_ast,
+    Query,
+)
 
 Predicate: TypeAlias = ASTGroupNode | Type[TModel] | bool
 
 
 class MongoDBCountAction(CountAction[MongoDBConnection, OmmiModel]):
     def __init__(
-        self, connection: MongoDBConnection, predicates: Sequence[Predicate], database
+        self,
+        connection: MongoDBConnection,
+        predicates: Sequence[Predicate],
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
     ):
         super().__init__(connection, predicates)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
 
     @async_result
     async def count(self) -> int:
         query = process_ast(when(*self._predicates))
-        pipeline, model = build_pipeline(query)
+        if self._read_cache is None:
+            return await self._count(query)
+
+        return await self._read_cache.load("count", query, lambda: self._count(query))
+
+    async def _count(self, query: Query) -> int:
+        if not query.collections:
+            match, options = build_find_arguments(query)
+            options.pop("sort", None)
+            return await get_collection(
+                self._db, query.collection.__ommi__.model_name
+            ).count_documents(match, session=self._session, **options)
+
+        pipeline, model = build_pipeline(query, hide_joins=False)
         pipeline.append({"$count": "count"})
         result = (
-            await self._db[model.__ommi__.model_name].aggregate(pipeline).to_list(1)
+            await get_collection(self._db, model.__ommi__.model_name)
+            .aggregate(pipeline, session=self._session)
+            .to_list(1)
         )
         return result[0].get("count", 0)
@@ -1,10 +1,19 @@
 from typing import Sequence, Type, Any
+from pymongo.client_session import ClientSession
 from tramp.optionals import Optional
 
 from ommi.drivers.database_results import async_result
 from ommi.drivers.delete_actions import DeleteAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
-from ommi.ext.drivers.mongodb.utils import build_pipeline, process_ast, Query
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.utils import (
+    build_pipeline,
+    create_match_filter,
+    get_collection,
+    is_replica_set,
+    process_ast,
+    Query,
+)
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
 
@@ -12,19 +21,29 @@ Predicate = ASTGroupNode | type(OmmiModel) | bool
 
 
 class MongoDBDeleteAction(DeleteAction[MongoDBConnection, OmmiModel]):
+    delete_batch_size = 1000
+
     def __init__(
-        self, connection: MongoDBConnection, predicates: Sequence[Predicate], database
+        self,
+        connection: MongoDBConnection,
+        predicates: Sequence[Predicate],
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
     ):
         super().__init__(connection, predicates)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
         self._is_replica_set_result: Optional[bool] = Optional.Nothing
 
     @property
     async def _is_replica_set(self) -> bool:
         match self._is_replica_set_result:
             case Optional.Nothing:
-                result = await self._connection.local.system.replset.find().to_list(1)
-                self._is_replica_set_result = Optional.Some(len(result) != 0)
+                result = await is_replica_set(self._connection)
+                self._is_replica_set_result = Optional.Some(result)
+                return result
 
             case Optional.Some(result):
                 return result
@@ -32,6 +51,9 @@ class MongoDBDeleteAction(DeleteAction[MongoDBConnection, OmmiModel]):
     @async_result
     async def delete(self) -> bool:
         query = process_ast(when(*self._predicates))
+        if self._read_cache:
+            self._read_cache.invalidate(query.collection.__ommi__.model_name)
+
         if query.collections:
             return await self._join_delete(query)
 
@@ -40,12 +62,15 @@ class MongoDBDeleteAction(DeleteAction[MongoDBConnection, OmmiModel]):
     async def _delete(
         self, model: Type[OmmiModel], match: list[dict[str, Any]]
     ) -> bool:
-        await self._db[model.__ommi__.model_name].delete_many(
-            {"$and": match} if match else {},
+        await get_collection(self._db, model.__ommi__.model_name).delete_many(
+            create_match_filter(match), session=self._session
         )
         return True
 
     async def _join_delete(self, query: Query) -> bool:
+        if self._session:
+            return await self._do_join_delete(query, self._session)
+
         async with await self._connection.start_session() as session:
             if await self._is_replica_set:
                 return await self._transaction_delete(query, session)
@@ -53,14 +78,23 @@ class MongoDBDeleteAction(DeleteAction[MongoDBConnection, OmmiModel]):
             return await self._do_join_delete(query, session)
 
     async def _do_join_delete(self, query: Query, session=None) -> bool:
-        pipeline, model = build_pipeline(query)
-        documents_to_delete = self._db[model.__ommi__.model_name].aggregate(
-            pipeline, session=session
-        )
-        await self._db[model.__ommi__.model_name].delete_many(
-            {"_id": {"$in": [doc["_id"] async for doc in documents_to_delete]}},
-            session=session,
+        pipeline, model = build_pipeline(query, hide_joins=False)
+        pipeline.append({"$project": {"_id": 1}})
+        collection = get_collection(self._db, model.__ommi__.model_name)
+        documents_to_delete = collection.aggregate(
+            pipeline, session=session, batchSize=self.delete_batch_size
         )
+        # Delete in chunks as the ids stream in so huge matches don't build one giant $in list
+        ids = []
+        async for document in documents_to_delete:
+            ids.append(document["_id"])
+            if len(ids) >= self.delete_batch_size:
+                await collection.delete_many({"_id": {"$in": ids}}, session=session)
+                ids = []
+
+        if ids:
+            await collection.delete_many({"_id": {"$in": ids}}, session=session)
+
         return True
 
     async def _transaction_delete(self, query: Query, session) -> bool:
@@ -2,6 +2,8 @@ from typing import Type, TypeAlias
 from dataclasses import dataclass
 
 import motor.motor_asyncio
+from pymongo.client_session import ClientSession
+from tramp.optionals import Optional
 
 from ommi.drivers import DatabaseDriver, DriverConfig
 from ommi.drivers.database_results import async_result
@@ -9,8 +11,11 @@ from ommi.drivers.driver_types import TModel
 from ommi.drivers.drivers import enforce_connection_protocol, connection_context_manager
 from ommi.ext.drivers.mongodb.add_action import MongoDBAddAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
 from ommi.ext.drivers.mongodb.find_action import MongoDBFindAction
 from ommi.ext.drivers.mongodb.schema_action import MongoDBSchemaAction
+from ommi.ext.drivers.mongodb.transactions import MongoDBTransaction
+from ommi.ext.drivers.mongodb.utils import is_replica_set
 from ommi.models.collections import ModelCollection
 from ommi.models import OmmiModel
 from ommi.query_ast import ASTGroupNode
@@ -35,6 +40,21 @@ class MongoDBDriver(
     def __init__(self, connection: MongoDBConnection, database):
         super().__init__(connection)
         self._db = database
+        self._is_replica_set_result: Optional[bool] = Optional.Nothing
+
+    @property
+    def database(self):
+        return self._db
+
+    async def is_replica_set(self) -> bool:
+        match self._is_replica_set_result:
+            case Optional.Nothing:
+                result = await is_replica_set(self._connection)
+                self._is_replica_set_result = Optional.Some(result)
+                return result
+
+            case Optional.Some(result):
+                return result
 
     @async_result
     async def disconnect(self) -> bool:
@@ -46,14 +66,24 @@ class MongoDBDriver(
     def add(self) -> MongoDBAddAction:
         return MongoDBAddAction(self._connection, self._db)
 
-    def find(self, *predicates: Predicate) -> MongoDBFindAction:
-        return MongoDBFindAction(self._connection, predicates, self._db)
+    def find(
+        self,
+        *predicates: Predicate,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
+    ) -> MongoDBFindAction:
+        return MongoDBFindAction(
+            self._connection, predicates, self._db, session, read_cache
+        )
 
     def schema(
-        self, model_collection: ModelCollection[Type[OmmiModel]] | None = None
+        self, model_collection: ModelCollection[Type[OmmiModel]] | None = None, **_
     ) -> MongoDBSchemaAction:
         return MongoDBSchemaAction(self._connection, model_collection, self._db)
 
+    def transaction(self) -> MongoDBTransaction:
+        return MongoDBTransaction(self)
+
     @classmethod
     @connection_context_manager
     async def from_config(cls, config: MongoDBConfig) -> "MongoDBDriver":
@@ -1,13 +1,22 @@
 from typing import Type, Any, TypeVar, Sequence
 
+from pymongo.client_session import ClientSession
+
 from ommi.drivers.database_results import async_result
 from ommi.drivers.fetch_actions import FetchAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
-from ommi.ext.drivers.mongodb.utils import build_pipeline, process_ast
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.utils import (
+    build_find_arguments,
+    build_pipeline,
+    get_collection,
+    get_document_mapping,
+    process_ast,
+    Query,
+)
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
 
-
 T = TypeVar("T")
 Predicate = ASTGroupNode | Type[OmmiModel] | bool
 
@@ -18,26 +27,53 @@ class Iteratable:
 
 class MongoDBFetchAction(FetchAction[MongoDBConnection, OmmiModel]):
     def __init__(
-        self, connection: MongoDBConnection, predicates: Sequence[Predicate], database
+        self,
+        connection: MongoDBConnection,
+        predicates: Sequence[Predicate],
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
     ):
         super().__init__(connection, predicates)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
 
     @async_result
     async def fetch(self) -> list[OmmiModel]:
         query = process_ast(when(*self._predicates))
-        pipeline, model = build_pipeline(query)
-        results = self._db[model.__ommi__.model_name].aggregate(pipeline)
-        return [self._create_model(result, model) async for result in results]
+        if self._read_cache is None:
+            documents = await self._fetch_documents(query)
+
+        else:
+            documents = await self._read_cache.load(
+                "fetch", query, lambda: self._fetch_documents(query)
+            )
+
+        return [
+            self._create_model(document, query.collection) for document in documents
+        ]
 
     async def one(self) -> OmmiModel:
         return (await self.all())[0]
 
+    async def _fetch_documents(self, query: Query) -> list[dict[str, Any]]:
+        if query.collections:
+            pipeline, model = build_pipeline(query)
+            results = get_collection(self._db, model.__ommi__.model_name).aggregate(
+                pipeline, session=self._session
+            )
+
+        else:
+            match, options = build_find_arguments(query)
+            results = get_collection(
+                self._db, query.collection.__ommi__.model_name
+            ).find(match, session=self._session, **options)
+
+        return [document async for document in results]
+
     def _create_model(self, data: dict[str, Any], model: Type[OmmiModel]) -> OmmiModel:
-        field_mapping = {
-            field.get("store_as"): field.get("field_name")
-            for field in model.__ommi__.fields.values()
-        }
+        field_mapping = get_document_mapping(model)
         instance = model(
             **{
                 field_mapping[key]: value
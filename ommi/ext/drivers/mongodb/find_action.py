@@ -1,5 +1,7 @@
 from typing import Sequence, Type
 
+from pymongo.client_session import ClientSession
+
 from ommi.drivers.count_actions import CountAction
 from ommi.drivers.delete_actions import DeleteAction
 from ommi.drivers.driver_types import TModel, TConn
@@ -7,6 +9,7 @@ from ommi.drivers.fetch_actions import FetchAction
 from ommi.drivers.find_actions import FindAction
 from ommi.drivers.set_fields_actions import SetFieldsAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
 from ommi.ext.drivers.mongodb.count_action import MongoDBCountAction
 from ommi.ext.drivers.mongodb.delete_action import MongoDBDeleteAction
 from ommi.ext.drivers.mongodb.fetch_action import MongoDBFetchAction
@@ -24,23 +27,54 @@ class MongoDBFindAction(FindAction[MongoDBConnection, OmmiModel]):
     _set_fields_action = MongoDBSetFieldsAction
 
     def __init__(
-        self, connection: MongoDBConnection, predicates: Sequence[Predicate], database
+        self,
+        connection: MongoDBConnection,
+        predicates: Sequence[Predicate],
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
     ):
         super().__init__(connection, predicates)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
 
     @property
     def count(self) -> CountAction[TConn, TModel]:
-        return self._count_action(self._connection, self._predicates, self._db)
+        return self._count_action(
+            self._connection,
+            self._predicates,
+            self._db,
+            self._session,
+            self._read_cache,
+        )
 
     @property
     def delete(self) -> DeleteAction[TConn, TModel]:
-        return self._delete_action(self._connection, self._predicates, self._db)
+        return self._delete_action(
+            self._connection,
+            self._predicates,
+            self._db,
+            self._session,
+            self._read_cache,
+        )
 
     @property
     def fetch(self) -> FetchAction[TConn, TModel]:
-        return self._fetch_action(self._connection, self._predicates, self._db)
+        return self._fetch_action(
+            self._connection,
+            self._predicates,
+            self._db,
+            self._session,
+            self._read_cache,
+        )
 
     @property
     def set(self) -> SetFieldsAction[TConn, TModel]:
-        return self._set_fields_action(self._connection, self._predicates, self._db)
+        return self._set_fields_action(
+            self._connection,
+            self._predicates,
+            self._db,
+            self._session,
+            self._read_cache,
+        )
@@ -0,0 +1,68 @@
+from copy import deepcopy
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import bson
+from bson.errors import InvalidDocument
+
+from ommi.ext.drivers.mongodb.utils import Query
+
+T = TypeVar("T")
+
+
+class MongoDBReadCache:
+    """Remembers the results of reads made within a transaction so that repeating a read doesn't go back to the
+    server. Results are dropped whenever a collection they were read from is written to through the transaction. Every
+    read gets its own copy of the results, so changing the models built from one read doesn't change later reads.
+
+    Updates queued with queue_update aren't sent until the transaction commits, so reads made within the transaction
+    don't see them, whether or not the read was cached.
+    """
+
+    def __init__(self):
+        self._results: dict[Hashable, tuple[frozenset[str], Any]] = {}
+
+    async def load(
+        self, operation: str, query: Query, loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        key = self._create_key(operation, query)
+        if key is None:
+            return await loader()
+
+        if key in self._results:
+            return deepcopy(self._results[key][1])
+
+        result = await loader()
+        self._results[key] = self._get_collection_names(query), deepcopy(result)
+        return result
+
+    def invalidate(self, collection_name: str):
+        self._results = {
+            key: entry
+            for key, entry in self._results.items()
+            if collection_name not in entry[0]
+        }
+
+    def _create_key(self, operation: str, query: Query) -> Hashable | None:
+        # Queries are keyed by the AST shape their skeleton was cached under, so a read never has to build its
+        # pipeline or find arguments just to check the cache. Only the literal values need to be encoded.
+        try:
+            values = bson.encode({"values": query.values}) if query.values else b""
+
+        except InvalidDocument:
+            # Values that need the database's custom codecs can't be encoded here, those reads aren't cached
+            return None
+
+        return (
+            operation,
+            query.shape,
+            values,
+            tuple((sort.model, sort.field, sort.ordering) for sort in query.sorts),
+            query.max_results,
+            query.results_page,
+        )
+
+    def _get_collection_names(self, query: Query) -> frozenset[str]:
+        return frozenset(
+            model.__ommi__.model_name
+            for model in (query.collection, *query.collections)
+        )
@@ -1,9 +1,14 @@
+import asyncio
+from contextlib import suppress
 from typing import Type, Iterable
 
+from pymongo.errors import CollectionInvalid
+
 from ommi.drivers.database_results import async_result
 from ommi.drivers.driver_types import TModel
 from ommi.drivers.schema_actions import SchemaAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
+from ommi.ext.drivers.mongodb.utils import get_collection
 from ommi.models.collections import ModelCollection
 from ommi.models import OmmiModel
 
@@ -27,12 +32,25 @@ class MongoDBSchemaAction(SchemaAction[MongoDBConnection, OmmiModel]):
 
     @async_result
     async def create_models(self) -> Iterable[Type[OmmiModel]]:
-        for model in self._model_collection.models:
-            self._db.create_collection(model.__ommi__.model_name)
+        await asyncio.gather(
+            *(
+                self._create_collection(model.__ommi__.model_name)
+                for model in self._model_collection.models
+            )
+        )
 
         return self._model_collection.models
 
     @async_result
     async def delete_models(self) -> None:
-        for model in self._model_collection.models:
-            await self._db[model.__ommi__.model_name].drop()
+        await asyncio.gather(
+            *(
+                get_collection(self._db, model.__ommi__.model_name).drop()
+                for model in self._model_collection.models
+            )
+        )
+
+    async def _create_collection(self, name: str):
+        # Matches the CREATE TABLE IF NOT EXISTS behavior of the SQL drivers
+        with suppress(CollectionInvalid):
+            await self._db.create_collection(name)
@@ -1,9 +1,21 @@
 from typing import Any, Sequence
 
+from pymongo.client_session import ClientSession
+
 from ommi.drivers.database_results import async_result
 from ommi.drivers.set_fields_actions import SetFieldsAction
 from ommi.ext.drivers.mongodb.connection_protocol import MongoDBConnection
-from ommi.ext.drivers.mongodb.utils import process_ast, create_lookup_stages
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.utils import (
+    build_pipeline,
+    build_update_pipeline,
+    create_match_filter,
+    create_set_stage,
+    execute_pipeline,
+    get_collection,
+    process_ast,
+    Query,
+)
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
 
@@ -12,45 +24,57 @@ Predicate = ASTGroupNode | type[OmmiModel] | bool
 
 class MongoDBSetFieldsAction(SetFieldsAction[MongoDBConnection, OmmiModel]):
     def __init__(
-        self, connection: MongoDBConnection, predicates: Sequence[Predicate], database
+        self,
+        connection: MongoDBConnection,
+        predicates: Sequence[Predicate],
+        database,
+        session: ClientSession | None = None,
+        read_cache: MongoDBReadCache | None = None,
     ):
         super().__init__(connection, predicates)
         self._db = database
+        self._session = session
+        self._read_cache = read_cache
+        self._ast = when(*predicates)
 
     @async_result
     async def set_fields(self, **kwargs: Any) -> bool:
-        query = process_ast(when(*self._predicates))
-        pipeline = [
-            {
-                "$match": {
-                    "$and": query.match,
-                },
-            },
-            {
-                "$set": {
-                    query.collection.__ommi__.fields[name].get("store_as"): value
-                    for name, value in kwargs.items()
-                },
-            },
-        ]
-
-        if query.collections:
-            lookups, unwind, project = create_lookup_stages(
-                query.collection, query.collections
+        if not kwargs:
+            return True
+
+        query = process_ast(self._ast)
+        if self._read_cache:
+            self._read_cache.invalidate(query.collection.__ommi__.model_name)
+
+        collection = get_collection(self._db, query.collection.__ommi__.model_name)
+        set_stage = create_set_stage(query.collection, kwargs)
+        if not query.collections:
+            await collection.update_many(
+                create_match_filter(query.match), set_stage, session=self._session
             )
-            pipeline = [*lookups, *unwind, *pipeline, project]
-
-        pipeline.append(
-            {
-                "$merge": {
-                    "into": query.collection.__ommi__.model_name,
-                    "on": "_id",
-                    "whenMatched": "replace",
-                },
-            }
-        )
+            return True
+
+        if self._session:
+            # $merge isn't allowed in a transaction so the matched documents are looked up and updated by id instead
+            await self._update_by_ids(query, collection, set_stage)
+            return True
 
-        await self._db[query.collection.__ommi__.model_name].aggregate(
-            pipeline
-        ).to_list(1)
+        await execute_pipeline(
+            collection, build_update_pipeline(self._ast, set_stage), self._session
+        )
         return True
+
+    async def _update_by_ids(
+        self, query: Query, collection, set_stage: dict[str, dict[str, Any]]
+    ):
+        pipeline, _ = build_pipeline(query, hide_joins=False)
+        pipeline.append({"$project": {"_id": 1}})
+        documents = await collection.aggregate(pipeline, session=self._session).to_list(
+            None
+        )
+        if documents:
+            await collection.update_many(
+                {"_id": {"$in": [document["_id"] for document in documents]}},
+                set_stage,
+                session=self._session,
+            )
@@ -0,0 +1,139 @@
+from contextlib import asynccontextmanager
+from typing import Any, Type
+
+from pymongo import UpdateMany
+
+from ommi.drivers.transactions import Transaction
+from ommi.ext.drivers.mongodb.add_action import MongoDBAddAction
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.utils import (
+    create_match_filter,
+    create_set_stage,
+    get_collection,
+    process_ast,
+)
+from ommi.models import OmmiModel
+from ommi.query_ast import when, ASTGroupNode
+
+Predicate = ASTGroupNode | Type[OmmiModel] | bool
+
+
+class MongoDBTransaction(Transaction):
+    def __init__(self, driver):
+        self._session = None
+        self._pending_updates: dict[str, list[UpdateMany]] = {}
+        self._pending_fields: dict[str, tuple[set[str], set[str]]] = {}
+        self._ordered_collections: set[str] = set()
+        self._read_cache = MongoDBReadCache()
+
+        super().__init__(
+            driver, [self._start_transaction()], read_cache=self._read_cache
+        )
+
+    @property
+    def add(self) -> MongoDBAddAction:
+        return MongoDBAddAction(
+            self.driver.connection,
+            self.driver.database,
+            self._session,
+            self._read_cache,
+        )
+
+    def queue_update(self, *predicates: Predicate, **fields: Any) -> None:
+        """Queues an update to be sent when the transaction commits. Every queued update for a collection is sent in
+        a single bulk write rather than each update being its own round-trip. Updates that filter on joined models
+        cannot be expressed as a bulk write operation, use find(...).set(...) for those. Reads made within the
+        transaction won't see queued updates until they're sent."""
+        if self._rolled_back or (self._session and not self._session.in_transaction):
+            raise RuntimeError(
+                "Cannot queue updates after the transaction has been committed or rolled back"
+            )
+
+        if not fields:
+            return
+
+        query = process_ast(when(*predicates))
+        if query.collections:
+            raise ValueError("Queued updates cannot filter using joined models")
+
+        model_name = query.collection.__ommi__.model_name
+        match = create_match_filter(query.match)
+        set_stage = create_set_stage(query.collection, fields)
+        self._track_dependencies(model_name, match, set_stage["$set"])
+        self._pending_updates.setdefault(model_name, []).append(
+            UpdateMany(match, set_stage)
+        )
+
+    async def _commit(self):
+        await self._flush_updates()
+        await self._session.commit_transaction()
+
+    async def _rollback(self):
+        self._pending_updates.clear()
+        self._pending_fields.clear()
+        self._ordered_collections.clear()
+        await self._session.abort_transaction()
+
+    async def _flush_updates(self):
+        pending, self._pending_updates = self._pending_updates, {}
+        ordered, self._ordered_collections = self._ordered_collections, set()
+        self._pending_fields.clear()
+        for collection_name, operations in pending.items():
+            self._read_cache.invalidate(collection_name)
+            await get_collection(self.driver.database, collection_name).bulk_write(
+                operations,
+                ordered=collection_name in ordered,
+                session=self._session,
+            )
+
+    def _track_dependencies(
+        self, model_name: str, match: dict[str, Any], values: dict[str, Any]
+    ):
+        """Updates that don't write a field that another queued update reads or writes can be applied in any order,
+        so the server is free to apply them unordered. Once that's not true for a collection its updates have to be
+        sent as an ordered bulk write."""
+        read, written = self._pending_fields.setdefault(model_name, (set(), set()))
+        reads = self._get_filter_fields(match)
+        if not (
+            written.isdisjoint(reads)
+            and written.isdisjoint(values)
+            and read.isdisjoint(values)
+        ):
+            self._ordered_collections.add(model_name)
+
+        read.update(reads)
+        written.update(values)
+
+    def _get_filter_fields(self, document: Any) -> set[str]:
+        match document:
+            case dict():
+                return {
+                    name
+                    for key, value in document.items()
+                    for name in (
+                        self._get_filter_fields(value) if key.startswith("$") else {key}
+                    )
+                }
+
+            case list():
+                return {
+                    name for item in document for name in self._get_filter_fields(item)
+                }
+
+            case _:
+                return set()
+
+    @asynccontextmanager
+    async def _start_transaction(self):
+        if not await self.driver.is_replica_set():
+            raise RuntimeError(
+                "MongoDB transactions require a replica set member or mongos, not a standalone server"
+            )
+
+        async with await self.driver.connection.start_session() as session:
+            async with session.start_transaction():
+                self._session = self._extra_args["session"] = session
+                yield session
+
+                if session.in_transaction:
+                    await self._flush_updates()
@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field as dc_field
-from typing import Type, Any, TypeAlias, TypedDict
+from itertools import count
+from typing import Type, Any, Iterator, TypeAlias, TypedDict
 
 from ommi.models import OmmiModel
 from ommi.query_ast import (
@@ -12,6 +13,7 @@ from ommi.query_ast import (
     ASTLiteralNode,
     ASTReferenceNode,
 )
+from ommi.utils.model_cache import cache_on_model
 
 logical_operator_mapping = {
     ASTLogicalOperatorNode.AND: "$and",
@@ -80,42 +82,213 @@ LookupStages: TypeAlias = list[LookupStage]
 UnwindStages: TypeAlias = list[UnwindStage]
 
 
-@dataclass
+@dataclass(slots=True)
 class Query:
     collection: Type[OmmiModel] | None = None
     collections: list[Type[OmmiModel]] = dc_field(default_factory=list)
     match: list[Any] = dc_field(default_factory=list)
+    # Flags which top level match expressions filter on joined collections
+    joined: tuple[bool, ...] = ()
 
     sorts: list[ASTReferenceNode] = dc_field(default_factory=list)
     max_results: int = 0
     results_page: int = 0
 
+    # The shape of the AST the query was built from & its literal values, together they identify the query
+    shape: tuple[Any, ...] = ()
+    values: list[Any] = dc_field(default_factory=list)
+
     def add_collection(self, *collections: Type[OmmiModel]) -> None:
-        if not self.collection:
+        if self.collection is None:
             self.collection, *collections = collections
 
-        if collections:
-            self.collections.extend(
-                collection
-                for collection in collections
-                if collection not in self.collections and collection != self.collection
-            )
+        for collection in collections:
+            if collection is not self.collection and collection not in self.collections:
+                self.collections.append(collection)
+
+
+class _Literal:
+    """Placeholder for a literal value in a query skeleton, the index is the literal's position in the AST."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+_max_query_skeletons = 512
 
 
 def model_to_dict(model: OmmiModel, *, preserve_pk: bool = False) -> dict[str, Any]:
-    fields = list(model.__ommi__.fields.values())
-    pks = model.get_primary_key_fields()
-    return {
-        field.get("store_as"): getattr(model, field.get("field_name"))
-        for field in fields
-        if field not in pks
-        or preserve_pk
-        or getattr(model, field.get("field_name")) is not None
-    }
+    pks = _get_primary_key_names(type(model))
+    data = {}
+    for name, store_as in get_field_mapping(type(model)):
+        value = getattr(model, name)
+        if value is not None or preserve_pk or name not in pks:
+            data[store_as] = value
+
+    return data
+
+
+@cache_on_model
+def get_field_mapping(model: Type[OmmiModel]) -> tuple[tuple[str, str], ...]:
+    """Ordered (field name, store as) pairs for every field on a model. Cached on the model so converting models to &
+    from documents doesn't walk the field metadata for every document."""
+    return tuple(
+        (field.get("field_name"), field.get("store_as"))
+        for field in model.__ommi__.fields.values()
+    )
+
+
+@cache_on_model
+def get_document_mapping(model: Type[OmmiModel]) -> dict[str, str]:
+    """Maps the names fields are stored as to the model's field names."""
+    return {store_as: name for name, store_as in get_field_mapping(model)}
+
+
+@cache_on_model
+def get_store_as_mapping(model: Type[OmmiModel]) -> dict[str, str]:
+    """Maps the model's field names to the names they are stored as."""
+    return dict(get_field_mapping(model))
+
+
+@cache_on_model
+def _get_primary_key_names(model: Type[OmmiModel]) -> frozenset[str]:
+    return frozenset(pk.get("field_name") for pk in model.get_primary_key_fields())
 
 
 def process_ast(ast: ASTGroupNode) -> Query:
+    """Translates an AST into a query. The translation is cached on the AST so reusing a predicate, such as counting
+    and then updating within a transaction, only walks it once. The returned query is shared and must not be
+    modified."""
+    if (query := ast.translations.get(process_ast)) is None:
+        query = ast.translations[process_ast] = _create_query(ast)
+
+    return query
+
+
+def _create_query(ast: ASTGroupNode) -> Query:
+    # Queries that only differ by their literal values share a skeleton, so the skeleton is looked up by the shape of
+    # the AST and only the literal values need to be filled in
+    if (model := _get_first_model(ast)) is None:
+        return _process_ast(ast)
+
+    values = []
+    shape = _get_ast_shape(ast, values)
+    skeletons = _get_query_skeletons(model)
+    if (skeleton := skeletons.get(shape)) is None:
+        if len(skeletons) >= _max_query_skeletons:
+            skeletons.clear()
+
+        skeleton = skeletons[shape] = _process_ast(ast)
+        skeleton.shape = shape
+
+    # Without literals or paging there's nothing to fill in, so queries without filters, such as fetching every
+    # document in a collection, use the skeleton as is
+    if not values and not ast.sorting and ast.max_results <= 0:
+        return skeleton
+
+    query = Query(
+        skeleton.collection,
+        skeleton.collections,
+        _fill_literals(skeleton.match, values),
+        skeleton.joined,
+        shape=shape,
+        values=values,
+    )
+    if ast.sorting:
+        query.sorts = ast.sorting
+
+    if ast.max_results:
+        query.max_results = ast.max_results
+
+    if ast.results_page:
+        query.results_page = ast.results_page
+
+    return query
+
+
+@cache_on_model
+def _get_query_skeletons(model: Type[OmmiModel]) -> dict[tuple[Any, ...], Query]:
+    """Skeletons are cached on the first model their AST references, so they're collected along with it."""
+    return {}
+
+
+def _get_first_model(ast: ASTGroupNode) -> Type[OmmiModel] | None:
+    for item in ast.items:
+        if type(item) is ASTReferenceNode:
+            return item.model
+
+        if type(item) is ASTComparisonNode:
+            for operand in (item.left, item.right):
+                if type(operand) is ASTReferenceNode:
+                    return operand.model
+
+        elif type(item) is ASTGroupNode:
+            if (model := _get_first_model(item)) is not None:
+                return model
+
+    return None
+
+
+def _get_ast_shape(ast: ASTGroupNode, values: list[Any]) -> tuple[Any, ...]:
+    """Builds a hashable key for everything in the AST except its literal values, which are added to the values list
+    in the order the AST is walked. Operators are keyed by their enum values, hashing an enum member calls back into
+    Python while hashing an int doesn't."""
+    shape = []
+    for item in ast.items:
+        if type(item) is ASTComparisonNode:
+            shape.append(
+                (
+                    _get_operand_shape(item.left, values),
+                    item.operator._value_,
+                    _get_operand_shape(item.right, values),
+                )
+            )
+
+        elif type(item) is ASTGroupNode:
+            shape.append(_get_ast_shape(item, values))
+
+        elif type(item) is ASTReferenceNode:
+            shape.append((item.model, None))
+
+        elif type(item) is ASTLogicalOperatorNode:
+            shape.append(item._value_)
+
+        else:
+            shape.append(item)
+
+    return tuple(shape)
+
+
+def _get_operand_shape(node: Any, values: list[Any]) -> Any:
+    if type(node) is ASTLiteralNode:
+        values.append(node.value)
+        return _Literal
+
+    if type(node) is ASTReferenceNode:
+        # Field descriptors hash by identity, which avoids looking up store_as through the field's aggregated metadata
+        return node.model, node.field
+
+    return node
+
+
+def _fill_literals(skeleton: Any, values: list[Any]) -> Any:
+    if type(skeleton) is dict:
+        return {key: _fill_literals(value, values) for key, value in skeleton.items()}
+
+    if type(skeleton) is list:
+        return [_fill_literals(item, values) for item in skeleton]
+
+    if type(skeleton) is _Literal:
+        return values[skeleton.index]
+
+    return skeleton
+
+
+def _process_ast(ast: ASTGroupNode) -> Query:
     query = Query()
+    literals = map(_Literal, count())
     group_stack = [query.match]
     logical_operator_stack = [ASTLogicalOperatorNode.AND]
     node_stack = [iter(ast)]
@@ -129,7 +302,7 @@ def process_ast(ast: ASTGroupNode) -> Query:
 
             case ASTComparisonNode(left, right, op):
                 expression, collections = _process_comparison_ast(
-                    left, op, right, query.collection
+                    left, op, right, query.collection, literals
                 )
                 group_stack[~0].append(expression)
                 query.add_collection(*collections)
@@ -144,7 +317,7 @@ def process_ast(ast: ASTGroupNode) -> Query:
                         {logical_operator_mapping[op]: group_stack[~0]}
                     )
 
-                elif logical_operator_stack[~0] != op:
+                elif logical_operator_stack[~0] is not op:
                     logical_operator_stack.append(op)
                     group_stack.append([])
                     group_stack[~1].append(
@@ -165,45 +338,226 @@ def process_ast(ast: ASTGroupNode) -> Query:
             case node:
                 raise TypeError(f"Unexpected node type: {node}")
 
-    if ast.sorting:
-        query.sorts = ast.sorting
+    query.match = _merge_field_operators(query.match)
+    query.joined = tuple(map(_uses_join, query.match))
+    return query
 
-    if ast.max_results:
-        query.max_results = ast.max_results
 
-    if ast.results_page:
-        query.results_page = ast.results_page
+def _merge_field_operators(match: list[Any]) -> list[Any]:
+    """Merges top level comparisons on the same field into a single expression, so age > 10 and age < 20 become
+    {"age": {"$gt": 10, "$lt": 20}} rather than two expressions in an $and. Operators are only merged when the field
+    doesn't already use them, equality shortcuts are never merged."""
+    merged = []
+    fields = {}
+    for expression in match:
+        if len(expression) == 1:
+            [(name, operators)] = expression.items()
+            if not name.startswith("$") and type(operators) is dict:
+                if name in fields and fields[name].keys().isdisjoint(operators):
+                    fields[name].update(operators)
+                    continue
 
-    return query
+                operators = dict(operators)
+                fields.setdefault(name, operators)
+                expression = {name: operators}
+
+        merged.append(expression)
 
+    return merged
+
+
+def build_pipeline(
+    query: Query, *, hide_joins: bool = True
+) -> tuple[list[dict[str, Any]], Type[OmmiModel]]:
+    # Filters on the queried collection go ahead of the lookups so the server can use the collection's indexes and
+    # only joins the documents that could match
+    base_match, join_match = query.match, []
+    if query.collections:
+        base_match, join_match = _split_match(query)
 
-def build_pipeline(query: Query) -> tuple[list[dict[str, Any]], Type[OmmiModel]]:
     pipeline = []
-    if query.match:
-        pipeline.append({"$match": {"$and": query.match}})
+    if base_match:
+        pipeline.append({"$match": create_match_filter(base_match)})
+
+    if not query.collections:
+        pipeline.extend(_create_paging_stages(query))
+        return pipeline, query.collection
+
+    lookups, unwind, project = _get_lookup_stages(
+        query.collection, tuple(query.collections)
+    )
+    if _can_page_before_lookups(query, join_match):
+        pipeline.extend(_create_paging_stages(query))
+        pipeline.extend(lookups)
+        pipeline.extend(unwind)
+
+    else:
+        pipeline.extend(lookups)
+        pipeline.extend(unwind)
+        if join_match:
+            pipeline.append({"$match": create_match_filter(join_match)})
+
+        pipeline.extend(_create_paging_stages(query))
+
+    # Pipelines that only count or collect ids never return the joined fields, so they don't need to be hidden
+    if hide_joins:
+        pipeline.append(project)
+
+    return pipeline, query.collection
+
 
+def _create_paging_stages(query: Query) -> list[dict[str, Any]]:
+    stages = []
     if query.sorts:
-        pipeline.append(_create_sort_stage(query.sorts))
+        stages.append(_create_sort_stage(query.sorts))
 
     if query.max_results > 0:
-        pipeline.append(_create_limit_stage(query.max_results))
+        # Limiting to the end of the page before skipping keeps $sort immediately followed by $limit so the server can
+        # use a bounded top-k sort rather than sorting every matched document
+        skip = query.max_results * query.results_page
+        stages.append(_create_limit_stage(skip + query.max_results))
 
-        if query.results_page:
-            pipeline.append(_create_skip_stage(query.max_results, query.results_page))
+        if skip:
+            stages.append(_create_skip_stage(skip))
+
+    return stages
+
+
+def _can_page_before_lookups(query: Query, join_match: list[Any]) -> bool:
+    """Sorting & limiting can happen before the lookups when nothing after them can change which documents are
+    returned or their order. That's the case when there's no filtering on the joined fields, the sorts only use the
+    queried collection, and every lookup joins at most one document so unwinding doesn't add documents."""
+    if join_match or not (query.sorts or query.max_results > 0):
+        return False
+
+    if any(ref.model is not query.collection for ref in query.sorts):
+        return False
+
+    return all(
+        _joins_at_most_one(query.collection, collection)
+        for collection in query.collections
+    )
 
-    if len(query.collections):
+
+@cache_on_model
+def _joins_at_most_one(model: Type[OmmiModel], collection: Type[OmmiModel]) -> bool:
+    # Lookups use the collection's references to the model when it has any, those can match any number of documents
+    if collection.__ommi__.references.get(model):
+        return False
+
+    refs = model.__ommi__.references.get(collection)
+    if not refs:
+        return False
+
+    referenced = {id(ref.to_field) for ref in refs}
+    return all(id(pk) in referenced for pk in collection.get_primary_key_fields())
+
+
+def build_update_pipeline(
+    ast: ASTGroupNode, set_stage: dict[str, dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Builds a pipeline that updates the documents matched through joins by merging them back into their collection.
+    Only the $set stage changes between updates using the same predicates, so the stages around it are cached on the
+    AST."""
+    if (stages := ast.translations.get(build_update_pipeline)) is None:
+        query = process_ast(ast)
         lookups, unwind, project = create_lookup_stages(
             query.collection, query.collections
         )
-        pipeline = [*lookups, *unwind, *pipeline, project]
+        base_match, join_match = _split_match(query)
+        head = [{"$match": create_match_filter(base_match)}] if base_match else []
+        head.extend(lookups)
+        head.extend(unwind)
+        if join_match:
+            head.append({"$match": create_match_filter(join_match)})
+
+        stages = ast.translations[build_update_pipeline] = (
+            head,
+            [
+                project,
+                {
+                    "$merge": {
+                        "into": query.collection.__ommi__.model_name,
+                        "on": "_id",
+                        "whenMatched": "replace",
+                    },
+                },
+            ],
+        )
 
-    return pipeline, query.collection
+    head, tail = stages
+    return [*head, set_stage, *tail]
+
+
+def get_collection(database, name: str):
+    """Motor builds a new collection wrapper every time a database is indexed. The wrappers are cached on the database
+    they belong to so they are freed along with it."""
+    collections = vars(database).setdefault("__ommi_collections__", {})
+    if name not in collections:
+        collections[name] = database[name]
+
+    return collections[name]
+
+
+async def is_replica_set(connection) -> bool:
+    """Transactions are only allowed on replica set members & mongos routers, standalone servers don't support
+    them."""
+    hello = await connection.admin.command("hello")
+    return "setName" in hello or hello.get("msg") == "isdbgrid"
+
+
+async def execute_pipeline(
+    collection, pipeline: list[dict[str, Any]], session=None
+) -> None:
+    """Runs an aggregation pipeline that doesn't return any documents, such as a pipeline ending in a $merge. Asking
+    for zero documents sends the aggregate command without fetching a batch and the cursor is closed immediately."""
+    cursor = collection.aggregate(pipeline, session=session)
+    try:
+        await cursor.to_list(0)
+    finally:
+        await cursor.close()
+
+
+def build_find_arguments(query: Query) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Builds the filter & cursor options for queries that don't need any joins. These can skip the aggregation
+    pipeline entirely and go through a plain find/count_documents."""
+    options = {}
+    if query.sorts:
+        options["sort"] = list(_create_sort_stage(query.sorts)["$sort"].items())
+
+    if query.max_results > 0:
+        options["limit"] = query.max_results
+
+        if query.results_page:
+            options["skip"] = query.max_results * query.results_page
+
+    return create_match_filter(query.match), options
+
+
+def create_set_stage(
+    model: Type[OmmiModel], fields: dict[str, Any]
+) -> dict[str, dict[str, Any]]:
+    store_as = get_store_as_mapping(model)
+    values = {store_as[name]: value for name, value in fields.items()}
+    # MongoDB won't modify _id, catch that before sending an update that's going to fail
+    if "_id" in values:
+        raise ValueError(f"Cannot update the _id field of {model.__name__}")
+
+    return {"$set": values}
+
+
+def create_match_filter(match: list[dict[str, Any]]) -> dict[str, Any]:
+    # Single expressions don't need to be wrapped in an $and, it only adds depth the server has to evaluate
+    if len(match) == 1:
+        return match[0]
+
+    return {"$and": match} if match else {}
 
 
 def _create_sort_stage(sorts: list[ASTReferenceNode]) -> dict[str, Any]:
     return {
         "$sort": {
-            ref.field.name: 1 if ref.ordering == ResultOrdering.ASCENDING else -1
+            ref.field.name: 1 if ref.ordering is ResultOrdering.ASCENDING else -1
             for ref in sorts
         }
     }
@@ -215,11 +569,12 @@ def create_lookup_stages(
     hide = set()
     lookups = []
     unwind = []
+    model_name = model.__ommi__.model_name.lower()
     for collection in collections:
-        hide.add(f"__join__{collection.__ommi__.model_name}")
+        join_field = _get_join_field(collection)
+        hide.add(join_field)
 
         refs = _get_reference_fields(model, collection)
-        model_name = model.__ommi__.model_name.lower()
         lookups.append(
             {
                 "$lookup": {
@@ -231,8 +586,8 @@ def create_lookup_stages(
                     "pipeline": [
                         {
                             "$match": {
-                                "$expr": {
-                                    "$and": [
+                                "$expr": _create_expr_and(
+                                    [
                                         {
                                             "$eq": [
                                                 f"${foreign_field}",
@@ -241,11 +596,11 @@ def create_lookup_stages(
                                         }
                                         for local_field, foreign_field in refs
                                     ]
-                                }
+                                )
                             }
                         }
                     ],
-                    "as": f"__join__{collection.__ommi__.model_name}",
+                    "as": join_field,
                 }
             }
         )
@@ -253,7 +608,7 @@ def create_lookup_stages(
         unwind.append(
             {
                 "$unwind": {
-                    "path": f"$__join__{collection.__ommi__.model_name}",
+                    "path": "$" + join_field,
                     "preserveNullAndEmptyArrays": True,
                 }
             }
@@ -266,14 +621,55 @@ def create_lookup_stages(
     return lookups, unwind, project
 
 
+@cache_on_model
+def _get_lookup_stages(
+    model: Type[OmmiModel], collections: tuple[Type[OmmiModel], ...]
+) -> tuple[LookupStages, UnwindStages, ProjectStage]:
+    # The stages only depend on the models being joined so they're shared by every query that joins them
+    return create_lookup_stages(model, list(collections))
+
+
+@cache_on_model
+def _get_join_field(model: Type[OmmiModel]) -> str:
+    return f"__join__{model.__ommi__.model_name}"
+
+
+def _split_match(query: Query) -> tuple[list[Any], list[Any]]:
+    """Splits the top level of the match into the expressions that only filter the queried collection and the
+    expressions that need the joined collections."""
+    base_match, join_match = [], []
+    for expression, joined in zip(query.match, query.joined, strict=True):
+        (join_match if joined else base_match).append(expression)
+
+    return base_match, join_match
+
+
+def _uses_join(expression: Any) -> bool:
+    if type(expression) is dict:
+        return any(
+            key.startswith("__join__") or _uses_join(value)
+            for key, value in expression.items()
+        )
+
+    if type(expression) is list:
+        return any(_uses_join(item) for item in expression)
+
+    return False
+
+
+def _create_expr_and(expressions: list[dict[str, Any]]) -> dict[str, Any]:
+    return expressions[0] if len(expressions) == 1 else {"$and": expressions}
+
+
 def _create_limit_stage(max_results: int) -> dict[str, Any]:
     return {"$limit": max_results}
 
 
-def _create_skip_stage(max_results: int, results_page: int) -> dict[str, Any]:
-    return {"$skip": max_results * results_page}
+def _create_skip_stage(skip: int) -> dict[str, Any]:
+    return {"$skip": skip}
 
 
+@cache_on_model
 def _get_reference_fields(
     model: Type[OmmiModel], collection: Type[OmmiModel]
 ) -> tuple[tuple[LocalField, ForeignField], ...]:
@@ -293,50 +689,44 @@ def _process_comparison_ast(
     op: ASTOperatorNode,
     right: ASTLiteralNode | ASTReferenceNode,
     querying_model: Type[OmmiModel] | None,
+    literals: Iterator[Any],
 ) -> tuple[dict[str, Any], list[Type[OmmiModel]]]:
-    collections = []
-    match left, right:
-        case (
-            ASTReferenceNode(field=field, model=model),
-            ASTLiteralNode(value=value),
-        ):
-            collections.append(model)
-
-            name = field.metadata.get("store_as")
-            if (querying_model and model != querying_model) or (
-                not querying_model and collections and model != collections[0]
-            ):
-                name = f"__join__{model.__ommi__.model_name}.{name}"
-
-            expr = {
-                name: (
-                    value
-                    if op == ASTOperatorNode.EQUALS
-                    else {operator_mapping[op]: value}
-                )
-            }
+    if _is_node(left, ASTReferenceNode) and _is_node(right, ASTLiteralNode):
+        model = left.model
+        name = left.field.metadata.get("store_as")
+        if querying_model and model != querying_model:
+            name = f"{_get_join_field(model)}.{name}"
+
+        value = next(literals)
+        expr = {
+            name: (
+                value
+                if op is ASTOperatorNode.EQUALS
+                else {operator_mapping[op]: value}
+            )
+        }
 
-        case (
-            ASTLiteralNode(value=value),
-            ASTReferenceNode(field=field, model=model),
-        ):
-            collections.append(model)
-
-            name = field.metadata.get("store_as")
-            if model != querying_model or (
-                not querying_model and model != collections[0]
-            ):
-                name = f"__join__{model.__ommi__.model_name}.{name}"
-
-            expr = {
-                name: (
-                    value
-                    if op == ASTOperatorNode.EQUALS
-                    else {flipped_operator_mapping[op]: value}
-                )
-            }
+    elif _is_node(left, ASTLiteralNode) and _is_node(right, ASTReferenceNode):
+        model = right.model
+        name = right.field.metadata.get("store_as")
+        if model != querying_model:
+            name = f"{_get_join_field(model)}.{name}"
+
+        value = next(literals)
+        expr = {
+            name: (
+                value
+                if op is ASTOperatorNode.EQUALS
+                else {flipped_operator_mapping[op]: value}
+            )
+        }
+
+    else:
+        raise TypeError(f"Unexpected node type: {left} or {right}")
+
+    return expr, [model]
 
-        case _:
-            raise TypeError(f"Unexpected node type: {left} or {right}")
 
-    return expr, collections
+def _is_node(node: Any, node_type: type) -> bool:
+    # The AST only ever builds exact node types, so the identity check almost always answers without isinstance
+    return type(node) is node_type or isinstance(node, node_type)
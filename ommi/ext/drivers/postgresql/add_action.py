@@ -1,4 +1,5 @@
-from typing import Iterable, Type, Sequence
+from operator import attrgetter
+from typing import Callable, Iterable, Type, Sequence
 
 import psycopg
 
@@ -6,10 +7,14 @@ from ommi.drivers.add_actions import AddAction
 from ommi.drivers.database_results import async_result
 from ommi.drivers.driver_types import TModel
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
+from ommi.ext.drivers.postgresql.schema_action import PostgreSQLSchemaAction
 from ommi.models import OmmiModel
+from ommi.utils.model_cache import cache_on_model
 
 
 class PostgreSQLAddAction(AddAction[PostgreSQLConnection, OmmiModel]):
+    copy_threshold = 100
+
     @async_result
     async def items(self, *items: TModel) -> Iterable[TModel]:
         async with self._connection.transaction():
@@ -32,31 +37,35 @@ class PostgreSQLAddAction(AddAction[PostgreSQLConnection, OmmiModel]):
         session: psycopg.AsyncCursor,
         model: Type[OmmiModel],
     ):
-        query = [f"INSERT INTO {model.__ommi__.model_name}"]
-
-        fields = list(model.__ommi__.fields.values())
-        pks = {
-            pk: getattr(items[0], pk.get("field_name")) is not None
-            for pk in model.get_primary_key_fields()
-        }
-        columns = [field.get("store_as") for field in fields if pks.get(field, True)]
-        query.append(f"({','.join(columns)})")
+        pks = model.get_primary_key_fields()
+        pks_set = tuple(
+            getattr(items[0], pk.get("field_name")) is not None for pk in pks
+        )
+        columns, get_row, prefix, row_placeholders, suffix = self._get_insert_parts(
+            model, pks_set
+        )
+        if len(items) < self.copy_threshold:
+            values = []
+            for item in items:
+                values.extend(get_row(item))
 
-        values = []
-        inserts = []
-        for item in items:
-            qs = ",".join(["%s"] * len(columns))
-            inserts.append(f"({qs})")
-            values.extend(
-                getattr(item, field.get("field_name"))
-                for field in fields
-                if pks.get(field, True)
+            query = b"".join(
+                (prefix, b",".join([row_placeholders] * len(items)), suffix)
             )
 
-        query.append(f"VALUES {','.join(inserts)}")
-        query.append(f"RETURNING {', '.join(pk.get('store_as') for pk in pks)};")
+        elif all(pks_set):
+            # Nothing needs to be read back when every primary key is set, so large batches can be streamed using COPY
+            # rather than building a huge INSERT statement
+            await self._copy(items, session, model, columns, get_row)
+            return
+
+        else:
+            # Large batches that need their keys read back send each column as a single array, so the statement has
+            # one parameter per column no matter how many rows are inserted
+            query = self._get_unnest_statement(model, pks_set)
+            values = [list(column) for column in zip(*map(get_row, items))]
 
-        result = await session.execute(" ".join(query).encode(), values)
+        result = await session.execute(query, values)
 
         # Update the primary key field of the models that were inserted if the primary key is an auto-incrementing field
         item_stack = iter(items)
@@ -64,3 +73,76 @@ class PostgreSQLAddAction(AddAction[PostgreSQLConnection, OmmiModel]):
             item = next(item_stack)
             for pk, value in zip(pks, record):
                 setattr(item, pk.get("field_name"), value)
+
+    @staticmethod
+    @cache_on_model
+    def _get_insert_parts(
+        model: Type[OmmiModel], pks_set: tuple[bool, ...]
+    ) -> tuple[list[str], Callable[[OmmiModel], tuple], bytes, bytes, bytes]:
+        """Builds the columns, a row value getter & encoded statement fragments for inserting a model. Primary keys that
+        aren't set are left out so the database generates them."""
+        skipped = {
+            pk
+            for pk, is_set in zip(model.get_primary_key_fields(), pks_set)
+            if not is_set
+        }
+        fields = [f for f in model.__ommi__.fields.values() if f not in skipped]
+        columns = [field.get("store_as") for field in fields]
+        pks = ", ".join(pk.get("store_as") for pk in model.get_primary_key_fields())
+        return (
+            columns,
+            _create_row_getter([field.get("field_name") for field in fields]),
+            f"INSERT INTO {model.__ommi__.model_name} ({','.join(columns)}) VALUES ".encode(),
+            f"({','.join(['%s'] * len(columns))})".encode(),
+            f" RETURNING {pks};".encode(),
+        )
+
+    @staticmethod
+    @cache_on_model
+    def _get_unnest_statement(
+        model: Type[OmmiModel], pks_set: tuple[bool, ...]
+    ) -> bytes:
+        pks = model.get_primary_key_fields()
+        skipped = {pk for pk, is_set in zip(pks, pks_set) if not is_set}
+        fields = [f for f in model.__ommi__.fields.values() if f not in skipped]
+        arrays = ", ".join(
+            f"%s::{PostgreSQLSchemaAction.type_mapping.get(field.get('field_type'), 'TEXT')}[]"
+            for field in fields
+        )
+        aliases = ", ".join(f"c{index}" for index in range(len(fields)))
+        # RETURNING can't reference the ordinality, so the rows are inserted in the order they were given and the
+        # returned keys, which come back in insertion order, are matched to the items by position
+        return (
+            f"INSERT INTO {model.__ommi__.model_name} "
+            f"({','.join(field.get('store_as') for field in fields)}) "
+            f"SELECT {aliases} FROM UNNEST({arrays}) WITH ORDINALITY AS u({aliases}, ordinality) "
+            f"ORDER BY ordinality "
+            f"RETURNING {', '.join(pk.get('store_as') for pk in pks)};"
+        ).encode()
+
+    async def _copy(
+        self,
+        items: Sequence[OmmiModel],
+        session: psycopg.AsyncCursor,
+        model: Type[OmmiModel],
+        columns: list[str],
+        get_row: Callable[[OmmiModel], tuple],
+    ):
+        async with session.copy(
+            f"COPY {model.__ommi__.model_name} ({','.join(columns)}) FROM STDIN"
+        ) as copy:
+            for item in items:
+                await copy.write_row(get_row(item))
+
+
+def _create_row_getter(names: list[str]) -> Callable[[OmmiModel], tuple]:
+    """Creates a getter that gathers the named attributes of a model as a tuple in a single call. attrgetter only
+    returns a tuple when it's given more than one name."""
+    if len(names) > 1:
+        return attrgetter(*names)
+
+    if names:
+        get_value = attrgetter(*names)
+        return lambda item: (get_value(item),)
+
+    return lambda item: ()
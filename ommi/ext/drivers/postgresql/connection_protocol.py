@@ -1,4 +1,4 @@
-from typing import Protocol, runtime_checkable
+from typing import AsyncContextManager, Protocol, runtime_checkable
 import psycopg
 
 
@@ -7,6 +7,9 @@ class PostgreSQLConnection(Protocol):
     def cursor(self) -> psycopg.AsyncCursor:
         ...
 
+    def pipeline(self) -> AsyncContextManager[psycopg.AsyncPipeline]:
+        ...
+
     async def close(self) -> None:
         ...
 
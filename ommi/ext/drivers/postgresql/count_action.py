@@ -8,7 +8,12 @@ from ommi.drivers.driver_types import TModel
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode, ResultOrdering
-from ommi.ext.drivers.postgresql.utils import build_query, SelectQuery, generate_joins
+from ommi.ext.drivers.postgresql.utils import (
+    build_query,
+    generate_joins,
+    get_values_with_paging,
+    SelectQuery,
+)
 
 Predicate: TypeAlias = ASTGroupNode | Type[TModel] | bool
 
@@ -24,11 +29,16 @@ class PostgreSQLCountAction(CountAction[PostgreSQLConnection, OmmiModel]):
         query = build_query(predicates)
         query_str = self._build_count_query(query)
         result = await (
-            await session.execute(query_str.encode(), query.values)
+            await session.execute(query_str, get_values_with_paging(query))
         ).fetchone()
         return result[0]
 
     def _build_count_query(self, query: SelectQuery):
+        # LIMIT & OFFSET are bound as parameters, so a shape only has a statement for each combination of them
+        key = "count", query.limit > 0, query.limit > 0 and query.offset > 0
+        if not query.order_by and (statement := query.statements.get(key)):
+            return statement
+
         query_builder = [f"SELECT Count(*) FROM {query.model.__ommi__.model_name}"]
         if query.models:
             query_builder.extend(generate_joins(query.model, query.models))
@@ -37,10 +47,10 @@ class PostgreSQLCountAction(CountAction[PostgreSQLConnection, OmmiModel]):
             query_builder.append(f"WHERE {query.where}")
 
         if query.limit > 0:
-            query_builder.append(f"LIMIT {query.limit}")
+            query_builder.append("LIMIT %s")
 
             if query.offset > 0:
-                query_builder.append(f"OFFSET {query.offset}")
+                query_builder.append("OFFSET %s")
 
         if query.order_by:
             ordering = ", ".join(
@@ -49,5 +59,7 @@ class PostgreSQLCountAction(CountAction[PostgreSQLConnection, OmmiModel]):
             )
             query_builder.append("ORDER BY")
             query_builder.append(ordering)
+            return f"{' '.join(query_builder)};".encode()
 
-        return " ".join(query_builder) + ";"
+        statement = query.statements[key] = f"{' '.join(query_builder)};".encode()
+        return statement
@@ -1,16 +1,30 @@
-from typing import Type
+from typing import Sequence
 
 import psycopg
 
 from ommi.drivers.database_results import async_result
-from ommi.drivers.delete_actions import DeleteAction
+from ommi.drivers.delete_actions import DeleteAction, Predicate
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
-from ommi.ext.drivers.postgresql.utils import build_query, create_join_comparison
+from ommi.ext.drivers.postgresql.utils import (
+    build_query,
+    create_join_comparison,
+    SelectQuery,
+)
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
 
 
 class PostgreSQLDeleteAction(DeleteAction[PostgreSQLConnection, OmmiModel]):
+    def __init__(
+        self,
+        connection: PostgreSQLConnection,
+        predicates: Sequence[Predicate],
+        allow_truncate: bool = False,
+    ):
+        super().__init__(connection, predicates)
+        # Set from PostgreSQLConfig.allow_truncate, deletes without filters or joins use TRUNCATE when it's enabled
+        self._allow_truncate = allow_truncate
+
     @async_result
     async def delete(self) -> bool:
         ast = when(*self._predicates)
@@ -24,6 +38,19 @@ class PostgreSQLDeleteAction(DeleteAction[PostgreSQLConnection, OmmiModel]):
         session: psycopg.AsyncCursor,
     ):
         query = build_query(ast)
+        key = "delete", self._allow_truncate
+        if (statement := query.statements.get(key)) is None:
+            statement = query.statements[key] = self._build_delete_query(query)
+
+        await session.execute(statement, query.values)
+
+    def _build_delete_query(self, query: SelectQuery) -> bytes:
+        if not query.where and not query.models:
+            if self._allow_truncate:
+                return f"TRUNCATE TABLE {query.model.__ommi__.model_name};".encode()
+
+            return f"DELETE FROM {query.model.__ommi__.model_name};".encode()
+
         query_builder = ["DELETE FROM", query.model.__ommi__.model_name]
         where = [query.where]
         if query.models:
@@ -46,4 +73,4 @@ class PostgreSQLDeleteAction(DeleteAction[PostgreSQLConnection, OmmiModel]):
 
         query_builder.append("WHERE")
         query_builder.extend(where)
-        await session.execute(f"{' '.join(query_builder)};".encode(), query.values)
+        return f"{' '.join(query_builder)};".encode()
@@ -27,6 +27,14 @@ class PostgreSQLConfig(DriverConfig):
     username: str
     password: str
 
+    # Statements are prepared on the server once they've run this many times, queries with the same shape always send
+    # the same SQL so they're prepared after their first run. None disables preparing statements.
+    prepare_threshold: int | None = 1
+
+    # Deleting every row of a table uses TRUNCATE when this is enabled. TRUNCATE empties a table without scanning it,
+    # but it takes a stronger lock and fails on tables that other tables reference.
+    allow_truncate: bool = False
+
     def to_uri(self) -> str:
         return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database_name}"
 
@@ -37,6 +45,12 @@ class PostgreSQLDriver(
     driver_name="postgresql",
     nice_name="PostgreSQL",
 ):
+    def __init__(
+        self, connection: PostgreSQLConnection, allow_truncate: bool = False
+    ):
+        super().__init__(connection)
+        self._allow_truncate = allow_truncate
+
     @async_result
     async def disconnect(self) -> bool:
         await self._connection.close()
@@ -48,7 +62,9 @@ class PostgreSQLDriver(
         return PostgreSQLAddAction(self._connection)
 
     def find(self, *predicates: Predicate) -> PostgreSQLFindAction:
-        return PostgreSQLFindAction(self._connection, predicates)
+        return PostgreSQLFindAction(
+            self._connection, predicates, self._allow_truncate
+        )
 
     def schema(
         self, model_collection: ModelCollection[Type[OmmiModel]] | None = None, **_
@@ -61,5 +77,10 @@ class PostgreSQLDriver(
     @classmethod
     @connection_context_manager
     async def from_config(cls, config: PostgreSQLConfig) -> "PostgreSQLDriver":
-        connection = await psycopg.AsyncConnection.connect(config.to_uri())
-        return cls(cast(PostgreSQLConnection, connection))
+        connection = await psycopg.AsyncConnection.connect(
+            config.to_uri(), prepare_threshold=config.prepare_threshold
+        )
+        return cls(
+            cast(PostgreSQLConnection, connection),
+            allow_truncate=config.allow_truncate,
+        )
@@ -1,4 +1,4 @@
-from typing import Type, Any, Generator, TypeVar, Callable, get_origin
+from typing import Type, Any, TypeVar, Callable, get_origin
 from datetime import datetime, date
 
 import psycopg
@@ -6,9 +6,15 @@ import psycopg
 from ommi.drivers.database_results import async_result
 from ommi.drivers.fetch_actions import FetchAction
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
-from ommi.ext.drivers.postgresql.utils import build_query, SelectQuery, generate_joins
+from ommi.ext.drivers.postgresql.utils import (
+    build_query,
+    generate_joins,
+    get_values_with_paging,
+    SelectQuery,
+)
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode, ResultOrdering
+from ommi.utils.model_cache import cache_on_model
 
 
 T = TypeVar("T")
@@ -33,14 +39,36 @@ class PostgreSQLFetchAction(FetchAction[PostgreSQLConnection, OmmiModel]):
     async def _select(self, predicates: ASTGroupNode, session: psycopg.AsyncCursor):
         query = build_query(predicates)
         query_str = self._build_select_query(query)
-        result = await session.execute(query_str.encode(), query.values)
-        return [
-            query.model(**dict(self._validate_row_values(query.model, row)))
-            async for row in result
-        ]
+        result = await session.execute(query_str, get_values_with_paging(query))
+        rows = await result.fetchall()
+        names, validators = self._get_row_decoder(query.model)
+        if not validators:
+            return [query.model(**dict(zip(names, row))) for row in rows]
+
+        results = []
+        for row in rows:
+            values = dict(zip(names, row))
+            for name, validator in validators:
+                values[name] = validator(values[name])
+
+            results.append(query.model(**values))
+
+        return results
 
     def _build_select_query(self, query: SelectQuery):
-        query_builder = [f"SELECT * FROM {query.model.__ommi__.model_name}"]
+        # LIMIT & OFFSET are bound as parameters, so a shape only has a statement for each combination of them
+        key = "select", query.limit > 0, query.limit > 0 and query.offset > 0
+        if not query.order_by and (statement := query.statements.get(key)):
+            return statement
+
+        # Selecting the model's columns by name keeps joined tables' columns out of the results and matches the order
+        # rows are decoded in
+        table = query.model.__ommi__.model_name
+        columns = ", ".join(
+            f"{table}.{field.get('store_as')}"
+            for field in query.model.__ommi__.fields.values()
+        )
+        query_builder = [f"SELECT {columns} FROM {table}"]
         if query.models:
             query_builder.extend(generate_joins(query.model, query.models))
 
@@ -48,10 +76,10 @@ class PostgreSQLFetchAction(FetchAction[PostgreSQLConnection, OmmiModel]):
             query_builder.append(f"WHERE {query.where}")
 
         if query.limit > 0:
-            query_builder.append(f"LIMIT {query.limit}")
+            query_builder.append("LIMIT %s")
 
             if query.offset > 0:
-                query_builder.append(f"OFFSET {query.offset}")
+                query_builder.append("OFFSET %s")
 
         if query.order_by:
             ordering = ", ".join(
@@ -60,23 +88,39 @@ class PostgreSQLFetchAction(FetchAction[PostgreSQLConnection, OmmiModel]):
             )
             query_builder.append("ORDER BY")
             query_builder.append(ordering)
+            return f"{' '.join(query_builder)};".encode()
 
-        return " ".join(query_builder) + ";"
+        statement = query.statements[key] = f"{' '.join(query_builder)};".encode()
+        return statement
 
-    def _validate_row_values(
-        self, model: Type[OmmiModel], row: tuple[Any]
-    ) -> Generator[tuple[str, Any], None, None]:
-        for field, value in zip(model.__ommi__.fields.values(), row):
-            name = field.get("field_name")
-            if validator := self._find_type_validator(field.get("field_type", value)):
-                yield name, validator(value)
-            else:
-                yield name, value
+    @classmethod
+    def _get_row_decoder(
+        cls, model: Type[OmmiModel]
+    ) -> tuple[tuple[str, ...], tuple[tuple[str, Callable[[Any], Any]], ...]]:
+        return _create_row_decoder(model, cls)
 
-    def _find_type_validator(self, type_hint: Type[T]) -> Callable[[Any], T] | None:
+    @classmethod
+    def _find_type_validator(cls, type_hint: Type[T]) -> Callable[[Any], T] | None:
         hint = get_origin(type_hint) or type_hint
-        for validator_type, validator in self.type_validators.items():
+        for validator_type, validator in cls.type_validators.items():
             if issubclass(hint, validator_type):
                 return validator
 
         return None
+
+
+@cache_on_model
+def _create_row_decoder(
+    model: Type[OmmiModel], action_type: Type[PostgreSQLFetchAction]
+) -> tuple[tuple[str, ...], tuple[tuple[str, Callable[[Any], Any]], ...]]:
+    """Finds a model's field names, in column order, and the validators for the few fields that need one. Rows are
+    zipped into a dict with the names and only the fields with validators are touched after that."""
+    names = tuple(field.get("field_name") for field in model.__ommi__.fields.values())
+    validators = (
+        (
+            field.get("field_name"),
+            action_type._find_type_validator(field.get("field_type")),
+        )
+        for field in model.__ommi__.fields.values()
+    )
+    return names, tuple((name, v) for name, v in validators if v)
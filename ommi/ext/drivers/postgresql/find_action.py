@@ -1,4 +1,8 @@
-from ommi.drivers.find_actions import FindAction
+from typing import Sequence
+
+from ommi.drivers.delete_actions import DeleteAction
+from ommi.drivers.driver_types import TConn, TModel
+from ommi.drivers.find_actions import FindAction, Predicate
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
 from ommi.ext.drivers.postgresql.count_action import PostgreSQLCountAction
 from ommi.ext.drivers.postgresql.delete_action import PostgreSQLDeleteAction
@@ -12,3 +16,18 @@ class PostgreSQLFindAction(FindAction[PostgreSQLConnection, OmmiModel]):
     _delete_action = PostgreSQLDeleteAction
     _fetch_action = PostgreSQLFetchAction
     _set_fields_action = PostgreSQLSetFieldsAction
+
+    def __init__(
+        self,
+        connection: PostgreSQLConnection,
+        predicates: Sequence[Predicate],
+        allow_truncate: bool = False,
+    ):
+        super().__init__(connection, predicates)
+        self._allow_truncate = allow_truncate
+
+    @property
+    def delete(self) -> DeleteAction[TConn, TModel]:
+        return self._delete_action(
+            self._connection, self._predicates, self._allow_truncate
+        )
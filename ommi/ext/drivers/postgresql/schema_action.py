@@ -29,8 +29,11 @@ class PostgreSQLSchemaAction(SchemaAction[PostgreSQLConnection, OmmiModel]):
         ).models
 
         try:
-            for model in models:
-                await self._create_table(model, session)
+            # The tables don't depend on each other's results, so the statements are pipelined and only wait on the
+            # server once
+            async with self._connection.pipeline():
+                for model in models:
+                    await self._create_table(model, session)
 
         except:
             await self._connection.rollback()
@@ -52,10 +55,11 @@ class PostgreSQLSchemaAction(SchemaAction[PostgreSQLConnection, OmmiModel]):
         ).models
 
         try:
-            for model in models:
-                await session.execute(
-                    f"DROP TABLE IF EXISTS {model.__ommi__.model_name};"
-                )
+            async with self._connection.pipeline():
+                for model in models:
+                    await session.execute(
+                        f"DROP TABLE IF EXISTS {model.__ommi__.model_name};"
+                    )
 
         except:
             await self._connection.rollback()
@@ -5,7 +5,11 @@ import psycopg
 from ommi.drivers.database_results import async_result
 from ommi.drivers.set_fields_actions import SetFieldsAction
 from ommi.ext.drivers.postgresql.connection_protocol import PostgreSQLConnection
-from ommi.ext.drivers.postgresql.utils import build_query, create_join_comparison
+from ommi.ext.drivers.postgresql.utils import (
+    build_query,
+    create_join_comparison,
+    SelectQuery,
+)
 from ommi.ext.drivers.postgresql.utils import generate_joins
 from ommi.models import OmmiModel
 from ommi.query_ast import when, ASTGroupNode
@@ -26,6 +30,17 @@ class PostgreSQLSetFieldsAction(SetFieldsAction[PostgreSQLConnection, OmmiModel]
         session: psycopg.AsyncCursor,
     ):
         query = build_query(ast)
+        key = "update", *set_fields
+        if (statement := query.statements.get(key)) is None:
+            statement = query.statements[key] = self._build_update_query(
+                query, set_fields
+            )
+
+        await session.execute(statement, (*set_fields.values(), *query.values))
+
+    def _build_update_query(
+        self, query: SelectQuery, set_fields: dict[str, Any]
+    ) -> bytes:
         fields = query.model.__ommi__.fields
         where = query.where
         query_builder = [
@@ -36,10 +51,11 @@ class PostgreSQLSetFieldsAction(SetFieldsAction[PostgreSQLConnection, OmmiModel]
             ),
         ]
         if query.models:
-            from_join = query.models.pop(0)
+            # The models list is shared by every query with the same shape, so it must not be changed
+            from_join, *joins = query.models
             from_join_comparison = f"{create_join_comparison(query.model, from_join)}"
             query_builder.append(f"FROM {from_join.__ommi__.model_name}")
-            query_builder.extend(generate_joins(query.model, query.models))
+            query_builder.extend(generate_joins(query.model, joins))
 
             if where:
                 where = f"{from_join_comparison} AND ({where})"
@@ -50,7 +66,4 @@ class PostgreSQLSetFieldsAction(SetFieldsAction[PostgreSQLConnection, OmmiModel]
         if where:
             query_builder.append(f"WHERE {where}")
 
-        await session.execute(
-            f"{' '.join(query_builder)};".encode(),
-            (*set_fields.values(), *query.values),
-        )
+        return f"{' '.join(query_builder)};".encode()
@@ -12,6 +12,7 @@ from ommi.query_ast import (
     ASTLiteralNode,
     ASTReferenceNode,
 )
+from ommi.utils.model_cache import cache_on_model
 
 logical_operator_mapping = {
     ASTLogicalOperatorNode.AND: "AND",
@@ -38,6 +39,9 @@ class SelectQuery:
     values: list[Any] = dc_field(default_factory=list)
     where: str = ""
 
+    # Actions can store the statements they build from the query here, queries with the same shape share the dict
+    statements: dict[Any, str | bytes] = dc_field(default_factory=dict)
+
     def add_model(self, *models: Type[OmmiModel]):
         if not self.model:
             self.model, *models = models
@@ -48,56 +52,162 @@ class SelectQuery:
             )
 
 
+_max_query_templates = 512
+
+
 def build_query(ast: ASTGroupNode) -> SelectQuery:
-    query = SelectQuery(
+    # Queries that only differ by their literal values build the same SQL, so the models & where clause are looked up
+    # by the shape of the AST and only the values need to be gathered
+    values = []
+    shape = _get_ast_shape(ast, values)
+    model = _get_first_model(ast)
+    templates = {} if model is None else _get_query_templates(model)
+    if (template := templates.get(shape)) is None:
+        if len(templates) >= _max_query_templates:
+            templates.clear()
+
+        template = templates[shape] = _process_ast(ast)
+
+    return SelectQuery(
         limit=ast.max_results,
         offset=ast.results_page * ast.max_results,
+        model=template.model,
+        models=template.models,
         order_by=_process_ordering(ast.sorting),
+        values=values,
+        where=template.where,
+        statements=template.statements,
     )
+
+
+@cache_on_model
+def _get_query_templates(model: Type[OmmiModel]) -> dict[tuple[Any, ...], SelectQuery]:
+    """Templates are cached on the first model their AST references, so they're collected along with it."""
+    return {}
+
+
+def _get_first_model(ast: ASTGroupNode) -> Type[OmmiModel] | None:
+    for item in ast.items:
+        if type(item) is ASTReferenceNode:
+            return item.model
+
+        if type(item) is ASTComparisonNode:
+            for operand in (item.left, item.right):
+                if type(operand) is ASTReferenceNode:
+                    return operand.model
+
+        elif type(item) is ASTGroupNode:
+            if (model := _get_first_model(item)) is not None:
+                return model
+
+    return None
+
+
+def get_values_with_paging(query: SelectQuery) -> list[Any]:
+    """Adds the LIMIT & OFFSET parameters to the query's values when the query is paged."""
+    if query.limit <= 0:
+        return query.values
+
+    if query.offset <= 0:
+        return [*query.values, query.limit]
+
+    return [*query.values, query.limit, query.offset]
+
+
+def _get_ast_shape(ast: ASTGroupNode, values: list[Any]) -> tuple[Any, ...]:
+    """Builds a hashable key for everything in the AST except its literal values, which are added to the values list
+    in the same order the where clause uses them."""
+    return tuple(_get_node_shape(item, values) for item in ast.items)
+
+
+def _get_node_shape(node: Any, values: list[Any]) -> Any:
+    if type(node) is ASTComparisonNode:
+        return (
+            _get_node_shape(node.left, values),
+            node.operator,
+            _get_node_shape(node.right, values),
+        )
+
+    if type(node) is ASTLiteralNode:
+        values.append(node.value)
+        return ASTLiteralNode
+
+    if type(node) is ASTReferenceNode:
+        return node.model, node.field
+
+    if type(node) is ASTGroupNode:
+        return _get_ast_shape(node, values)
+
+    return node
+
+
+def _process_ast(ast: ASTGroupNode) -> SelectQuery:
+    query = SelectQuery()
     where = []
     node_stack = [iter(ast)]
     while node_stack:
-        match next(node_stack[~0], None):
-            case ASTGroupNode() as group:
-                node_stack.append(iter(group))
+        node = next(node_stack[~0], None)
+        if node is None:
+            node_stack.pop()
+            continue
 
-            case ASTReferenceNode(None, model):
-                query.add_model(model)
+        try:
+            handler = _node_handlers[type(node)]
+        except KeyError:
+            raise TypeError(f"Unexpected node type: {node}") from None
 
-            case ASTReferenceNode(field, model):
-                name = f"{model.__ommi__.model_name}.{field.metadata.get('store_as')}"
-                where.append(name)
-                query.add_model(model)
+        handler(node, where, query, node_stack)
 
-            case ASTLiteralNode(value):
-                where.append("%s")
-                query.values.append(value)
+    query.where = " ".join(where)
+    return query
 
-            case ASTLogicalOperatorNode() as op:
-                where.append(logical_operator_mapping[op])
 
-            case ASTOperatorNode() as op:
-                where.append(operator_mapping[op])
+def _process_group(group: ASTGroupNode, where, query, node_stack):
+    node_stack.append(iter(group))
 
-            case ASTComparisonNode(left, right, op):
-                node_stack.append(iter((left, op, right)))
 
-            case ASTGroupFlagNode.OPEN:
-                if len(node_stack) > 1:
-                    where.append("(")
+def _process_reference(ref: ASTReferenceNode, where, query, node_stack):
+    if ref.field is not None:
+        where.append(
+            f"{ref.model.__ommi__.model_name}.{ref.field.metadata.get('store_as')}"
+        )
 
-            case ASTGroupFlagNode.CLOSE:
-                if len(node_stack) > 1:
-                    where.append(")")
+    query.add_model(ref.model)
 
-            case None:
-                node_stack.pop()
 
-            case node:
-                raise TypeError(f"Unexpected node type: {node}")
+def _process_literal(literal: ASTLiteralNode, where, query, node_stack):
+    where.append("%s")
+    query.values.append(literal.value)
 
-    query.where = " ".join(where)
-    return query
+
+def _process_logical_operator(op: ASTLogicalOperatorNode, where, query, node_stack):
+    where.append(logical_operator_mapping[op])
+
+
+def _process_operator(op: ASTOperatorNode, where, query, node_stack):
+    where.append(operator_mapping[op])
+
+
+def _process_comparison(comparison: ASTComparisonNode, where, query, node_stack):
+    node_stack.append(iter((comparison.left, comparison.operator, comparison.right)))
+
+
+def _process_group_flag(flag: ASTGroupFlagNode, where, query, node_stack):
+    if len(node_stack) > 1:
+        where.append("(" if flag is ASTGroupFlagNode.OPEN else ")")
+
+
+# Dispatching on the exact node type is a single dict lookup, where the match statement would run through an
+# isinstance check for every case ahead of the one that matches
+_node_handlers = {
+    ASTGroupNode: _process_group,
+    ASTReferenceNode: _process_reference,
+    ASTLiteralNode: _process_literal,
+    ASTLogicalOperatorNode: _process_logical_operator,
+    ASTOperatorNode: _process_operator,
+    ASTComparisonNode: _process_comparison,
+    ASTGroupFlagNode: _process_group_flag,
+}
 
 
 def _process_ordering(sorting: list[ASTReferenceNode]) -> dict[str, ResultOrdering]:
@@ -111,10 +221,12 @@ def generate_joins(model: Type[OmmiModel], models: list[Type[OmmiModel]]):
         yield create_join(model, join)
 
 
+@cache_on_model
 def create_join(model: Type[OmmiModel], join_model: Type[OmmiModel]) -> str:
     return f"JOIN {join_model.__ommi__.model_name} ON {create_join_comparison(model, join_model)}"
 
 
+@cache_on_model
 def create_join_comparison(model: Type[OmmiModel], join_model: Type[OmmiModel]) -> str:
     if model in join_model.__ommi__.references:
         columns = " AND ".join(
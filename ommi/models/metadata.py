@@ -5,6 +5,7 @@ This module defines the dataclass that is used for storing all metadata associat
 """
 
 from dataclasses import dataclass, field as dc_field
+from typing import Any, Hashable
 
 from ommi.models.collections import get_global_collection
 from ommi.models.references import LazyReferenceBuilder
@@ -19,8 +20,17 @@ class OmmiMetadata:
     collection: "ommi.models.collections.ModelCollection" = dc_field(
         default_factory=get_global_collection
     )
+    primary_key_fields: "tuple[ommi.models.field_metadata.FieldMetadata, ...]" = ()
+    cache: dict[Hashable, Any] = dc_field(
+        default_factory=dict, repr=False, compare=False
+    )
 
     def clone(self, **kwargs) -> "OmmiMetadata":
+        # The cache holds values derived from this model, the clone needs its own
         return OmmiMetadata(
-            **{name: kwargs.get(name, value) for name, value in vars(self).items()}
+            **{
+                name: kwargs.get(name, value)
+                for name, value in vars(self).items()
+                if name != "cache"
+            }
         )
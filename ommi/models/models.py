@@ -175,26 +175,10 @@ class OmmiModel:
 
     @classmethod
     def get_primary_key_fields(cls) -> tuple[FieldMetadata, ...]:
-        fields = cls.__ommi__.fields
-        if not fields:
+        if not cls.__ommi__.primary_key_fields:
             raise Exception(f"No fields defined on {cls}")
 
-        def find_fields_where(predicate):
-            return tuple(f for f in fields.values() if predicate(f))
-
-        def find_field_where(predicate):
-            return first(find_fields_where(predicate))
-
-        if matches := find_fields_where(lambda f: f.matches(Key)):
-            return matches
-
-        if field := find_field_where(lambda f: f.get("store_as") in {"id", "_id"}):
-            return (field,)
-
-        if field := find_field_where(lambda f: issubclass(f.get("field_type"), int)):
-            return (field,)
-
-        return (first(fields.values()),)
+        return cls.__ommi__.primary_key_fields
 
     @classmethod
     def _build_column_predicates(
@@ -282,6 +266,7 @@ def _create_model(c: T, **kwargs) -> T | Type[OmmiModel]:
                 ),
                 fields=fields,
                 references=LazyReferenceBuilder(fields, c, sys.modules[c.__module__]),
+                primary_key_fields=_find_primary_key_fields(fields),
             ),
         },
     )
@@ -336,6 +321,33 @@ def _get_fields(fields: dict[str, Any]) -> dict[str, FieldMetadata]:
     return ommi_fields
 
 
+def _find_primary_key_fields(
+    fields: dict[str, FieldMetadata]
+) -> tuple[FieldMetadata, ...]:
+    if not fields:
+        return ()
+
+    def find_fields_where(predicate):
+        return tuple(f for f in fields.values() if predicate(f))
+
+    def find_field_where(predicate):
+        return first(find_fields_where(predicate))
+
+    if matches := find_fields_where(lambda f: f.matches(Key)):
+        return matches
+
+    if field := find_field_where(lambda f: f.get("store_as") in {"id", "_id"}):
+        return (field,)
+
+    if field := find_field_where(
+        lambda f: isinstance(f.get("field_type"), type)
+        and issubclass(f.get("field_type"), int)
+    ):
+        return (field,)
+
+    return (first(fields.values()),)
+
+
 def _get_query_fields(fields: dict[str, Any]) -> dict[str, Any]:
     return {
         name: annotation
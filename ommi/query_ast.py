@@ -60,6 +60,10 @@ class ASTGroupNode(ASTNode):
         self.results_page = 0
         self.sorting: list[ASTReferenceNode] = []
 
+        # Drivers can store their translation of the group here to reuse it across queries, it's cleared whenever the
+        # group is changed
+        self.translations: dict[Any, Any] = {}
+
     def __iter__(self):
         self.frozen = True
         if len(self.items) > 1:
@@ -80,14 +84,22 @@ class ASTGroupNode(ASTNode):
         if isinstance(item, type) and issubclass(item, models.OmmiModel):
             item = ASTReferenceNode(None, item)
 
-        elif len(self.items) > 0 and getattr(self.items[~0], "field", True) is not None:
+        elif self.items and not self._is_model_reference(self.items[~0]):
             self.items.append(logical_type)
 
         self.items.append(item)
+        self.translations.clear()
+
+    @staticmethod
+    def _is_model_reference(item) -> bool:
+        # Most items are comparisons, the exact type check avoids the AttributeError a getattr(item, "field") default
+        # would have to swallow for each of them
+        return type(item) is ASTReferenceNode and item.field is None
 
     def limit(self, limit: int, page: int = 0) -> Self:
         self.max_results = limit
         self.results_page = page
+        self.translations.clear()
         return self
 
     def sort(self, *on_fields: "ASTReferenceNode") -> Self:
@@ -98,6 +110,7 @@ class ASTGroupNode(ASTNode):
                 self.sorting.append(field)
                 unique.remove(field)
 
+        self.translations.clear()
         return self
 
     def __eq__(self, other):
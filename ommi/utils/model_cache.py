@@ -0,0 +1,21 @@
+from functools import wraps
+from typing import Any, Callable, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def cache_on_model(func: Callable[..., T]) -> Callable[..., T]:
+    """Caches a function's results in the metadata of the model passed as its first argument. The cached values live
+    exactly as long as the model, so models that are created dynamically can still be garbage collected."""
+
+    @wraps(func)
+    def wrapper(model: Type[Any], *args: Any) -> T:
+        cache = model.__ommi__.cache
+        key = (func, *args)
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = func(model, *args)
+            return result
+
+    return wrapper
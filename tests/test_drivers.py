@@ -10,6 +10,7 @@ from ommi.ext.drivers.sqlite import SQLiteDriver, SQLiteConfig
 from ommi.models.collections import ModelCollection
 from ommi.models import ommi_model
 from ommi.models.field_metadata import ReferenceTo, Key
+from ommi.query_ast import when
 from ommi.models.query_fields import (
     LazyLoadTheRelated,
     LazyLoadEveryRelated,
@@ -69,15 +70,20 @@ async def mongo():
         return driver
 
 
-@DriverFactory
-async def postgresql():
-    config = PostgreSQLConfig(
+def create_postgresql_config(**options):
+    return PostgreSQLConfig(
         host="127.0.0.1",
         port=5432,
         database_name="postgres",
         username="postgres",
         password="password",
+        **options,
     )
+
+
+@DriverFactory
+async def postgresql():
+    config = create_postgresql_config()
     try:
         driver = await PostgreSQLDriver.from_config(config)
         schema = driver.schema(test_models)
@@ -111,9 +117,12 @@ else:
 
 try:
     from ommi.ext.drivers.postgresql import PostgreSQLConfig, PostgreSQLDriver
+    from ommi.ext.drivers.postgresql.add_action import PostgreSQLAddAction
+    from ommi.ext.drivers.postgresql.utils import build_query
     import psycopg
 except ImportError:
-    PostgreSQLConfig = PostgreSQLDriver = psycopg = None
+    PostgreSQLConfig = PostgreSQLDriver = PostgreSQLAddAction = psycopg = None
+    build_query = None
 else:
     connections.append(postgresql)
 
@@ -203,6 +212,19 @@ async def test_delete(driver):
         assert len(result.value) == 0
 
 
+@pytest.mark.asyncio
+@parametrize_drivers()
+async def test_delete_all(driver):
+    async with driver as connection:
+        await connection.add(
+            TestModel(name="dummy1"), TestModel(name="dummy2")
+        ).raise_on_errors()
+
+        await connection.find(TestModel).delete().raise_on_errors()
+        result = await connection.find(TestModel).fetch()
+        assert len(result.value) == 0
+
+
 @pytest.mark.asyncio
 @parametrize_drivers()
 async def test_count(driver):
@@ -796,4 +818,288 @@ async def test_transaction_exception(driver):
                 raise TestException()
 
         result = await connection.find(InnerTestModel).fetch()
-        assert len(result.value) == 0
\ No newline at end of file
+        assert len(result.value) == 0
+
+
+def mongo_only():
+    return pytest.mark.skipif(MongoDBDriver is None, reason="MongoDB driver not installed")
+
+
+async def skip_without_mongo_transactions(connection):
+    if not await connection.is_replica_set():
+        pytest.skip("MongoDB transactions require a replica set")
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_requires_replica_set():
+    async with mongo as connection:
+        if await connection.is_replica_set():
+            pytest.skip("MongoDB is running as a replica set")
+
+        with pytest.raises(RuntimeError, match="replica set"):
+            async with connection.transaction():
+                ...
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_queued_updates_commit():
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+        await connection.add(
+            TestModel(name="dummy1"), TestModel(name="dummy2")
+        ).raise_on_errors()
+
+        async with connection.transaction() as transaction:
+            transaction.queue_update(TestModel.name == "dummy1", name="Dummy1")
+            transaction.queue_update(TestModel.name == "dummy2", name="Dummy2")
+
+        result = await connection.find(TestModel).fetch.all()
+        assert {m.name for m in result} == {"Dummy1", "Dummy2"}
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_queued_updates_rollback():
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+        await connection.add(TestModel(name="dummy")).raise_on_errors()
+
+        async with connection.transaction() as transaction:
+            transaction.queue_update(TestModel.name == "dummy", name="Dummy")
+            await transaction.rollback()
+
+        result = await connection.find(TestModel).fetch.all()
+        assert [m.name for m in result] == ["dummy"]
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_queued_update_after_commit():
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+        await connection.add(TestModel(name="dummy")).raise_on_errors()
+
+        async with connection.transaction() as transaction:
+            transaction.queue_update(TestModel.name == "dummy", name="Dummy")
+            await transaction.commit()
+
+            with pytest.raises(RuntimeError):
+                transaction.queue_update(TestModel.name == "Dummy", name="DUMMY")
+
+        result = await connection.find(TestModel).fetch.all()
+        assert [m.name for m in result] == ["Dummy"]
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_queued_update_rejects_joins():
+    join_collection = ModelCollection()
+
+    @ommi_model(collection=join_collection)
+    @dataclass
+    class JoinModelA:
+        id: int
+        name: str
+
+    @ommi_model(collection=join_collection)
+    @dataclass
+    class JoinModelB:
+        id: int
+        value: str
+
+        a_id: Annotated[int, ReferenceTo(JoinModelA.id)]
+
+    async with mongo as connection:
+        with pytest.raises(ValueError):
+            connection.transaction().queue_update(
+                JoinModelB, JoinModelA.name == "testing", value="foobar"
+            )
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_reads_see_writes():
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+
+        async with connection.transaction() as transaction:
+            await transaction.add(TestModel(name="dummy")).raise_on_errors()
+            assert await transaction.find(TestModel).count().value == 1
+
+            await transaction.add(TestModel(name="dummy")).raise_on_errors()
+            assert await transaction.find(TestModel).count().value == 2
+
+            await transaction.find(TestModel.name == "dummy").set(
+                name="Dummy"
+            ).raise_on_errors()
+            result = await transaction.find(TestModel.name == "Dummy").fetch.all()
+            assert len(result) == 2
+
+            await transaction.find(TestModel.name == "Dummy").delete().raise_on_errors()
+            assert await transaction.find(TestModel).count().value == 0
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_auto_increments_keys():
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+        await connection.add(TestModel(name="dummy1")).raise_on_errors()
+
+        async with connection.transaction() as transaction:
+            first, second = await transaction.add(
+                TestModel(name="dummy2"), TestModel(name="dummy3")
+            ).value
+
+        assert (first.id, second.id) == (1, 2)
+        result = await connection.find(TestModel).fetch.all()
+        assert {(m.id, m.name) for m in result} == {
+            (0, "dummy1"),
+            (1, "dummy2"),
+            (2, "dummy3"),
+        }
+
+
+@pytest.mark.asyncio
+@mongo_only()
+async def test_mongo_transaction_joined_update():
+    join_collection = ModelCollection()
+
+    @ommi_model(collection=join_collection)
+    @dataclass
+    class JoinModelA:
+        id: int
+        name: str
+
+    @ommi_model(collection=join_collection)
+    @dataclass
+    class JoinModelB:
+        id: int
+        value: str
+
+        a_id: Annotated[int, ReferenceTo(JoinModelA.id)]
+
+    async with mongo as connection:
+        await skip_without_mongo_transactions(connection)
+        await connection.schema(join_collection).delete_models().raise_on_errors()
+        await connection.add(
+            JoinModelA(id=1, name="testing"),
+            JoinModelA(id=2, name="other"),
+            JoinModelB(id=1, value="a", a_id=1),
+            JoinModelB(id=2, value="b", a_id=2),
+        ).raise_on_errors()
+
+        async with connection.transaction() as transaction:
+            await transaction.find(
+                JoinModelB, JoinModelA.name == "testing"
+            ).set(value="foobar").raise_on_errors()
+
+        result = await connection.find(JoinModelB).fetch.all()
+        assert {(m.id, m.value) for m in result} == {(1, "foobar"), (2, "b")}
+
+
+def postgresql_only():
+    return pytest.mark.skipif(
+        PostgreSQLDriver is None, reason="PostgreSQL driver not installed"
+    )
+
+
+@pytest.mark.asyncio
+@postgresql_only()
+async def test_postgresql_copy_large_batches(monkeypatch):
+    monkeypatch.setattr(PostgreSQLAddAction, "copy_threshold", 5)
+    copies = []
+    copy = PostgreSQLAddAction._copy
+
+    async def spy_copy(self, items, *args):
+        copies.append(len(items))
+        return await copy(self, items, *args)
+
+    monkeypatch.setattr(PostgreSQLAddAction, "_copy", spy_copy)
+    collection = ModelCollection()
+
+    @ommi_model(collection=collection)
+    @dataclass
+    class InnerTestModel:
+        id: int
+        name: str
+        toggle: bool
+        decimal: float
+
+    async with postgresql as connection:
+        await connection.schema(collection).delete_models().raise_on_errors()
+        await connection.schema(collection).create_models().raise_on_errors()
+
+        models = [InnerTestModel(n, f"model{n}", n % 2 == 0, n / 4) for n in range(10)]
+        await connection.add(*models).raise_on_errors()
+        assert copies == [10]
+
+        result = await connection.find(InnerTestModel).fetch.all()
+        assert sorted(result, key=lambda m: m.id) == models
+
+
+@pytest.mark.asyncio
+@postgresql_only()
+async def test_postgresql_unnest_large_batches(monkeypatch):
+    monkeypatch.setattr(PostgreSQLAddAction, "copy_threshold", 5)
+    statements = []
+    get_unnest_statement = PostgreSQLAddAction._get_unnest_statement
+
+    def spy_get_unnest_statement(*args):
+        statements.append(statement := get_unnest_statement(*args))
+        return statement
+
+    monkeypatch.setattr(
+        PostgreSQLAddAction,
+        "_get_unnest_statement",
+        staticmethod(spy_get_unnest_statement),
+    )
+    collection = ModelCollection()
+
+    @ommi_model(collection=collection)
+    @dataclass
+    class InnerTestModel:
+        name: str
+        toggle: bool
+        decimal: float
+        id: int = None
+
+    async with postgresql as connection:
+        await connection.schema(collection).delete_models().raise_on_errors()
+        await connection.schema(collection).create_models().raise_on_errors()
+
+        await connection.add(InnerTestModel("first", True, 0.5)).raise_on_errors()
+        models = [InnerTestModel(f"model{n}", n % 2 == 0, n / 4) for n in range(10)]
+        await connection.add(*models).raise_on_errors()
+        assert len(statements) == 1
+
+        ids = [model.id for model in models]
+        assert len(set(ids)) == len(ids)
+        assert all(isinstance(id_, int) for id_ in ids)
+        assert ids == sorted(ids)
+        for model in models:
+            result = await connection.find(InnerTestModel.id == model.id).fetch.one()
+            assert result == model
+
+
+@pytest.mark.asyncio
+@postgresql_only()
+async def test_postgresql_truncate_unfiltered_deletes():
+    async with PostgreSQLDriver.from_config(
+        create_postgresql_config(allow_truncate=True)
+    ) as connection:
+        schema = connection.schema(test_models)
+        await schema.delete_models().raise_on_errors()
+        await schema.create_models().raise_on_errors()
+        await connection.add(
+            TestModel(name="dummy1"), TestModel(name="dummy2")
+        ).raise_on_errors()
+
+        await connection.find(TestModel).delete().raise_on_errors()
+        result = await connection.find(TestModel).fetch()
+        assert len(result.value) == 0
+
+        statements = build_query(when(TestModel)).statements
+        assert statements[("delete", True)] == b"TRUNCATE TABLE TestModel;"
@@ -1,3 +1,5 @@
+import gc
+import weakref
 import dataclasses
 from typing import Annotated
 
@@ -127,6 +129,32 @@ def test_primary_key_named_id():
     assert all(pk.get("field_name") == "id" for pk in pks)
 
 
+def test_primary_key_fields_are_cached():
+    @ommi_model(collection=ModelCollection())
+    @dataclasses.dataclass
+    class Model:
+        name: str
+        id: int
+
+    assert Model.get_primary_key_fields() is Model.get_primary_key_fields()
+    assert Model(name="a", id=1).get_primary_key_fields() is Model.get_primary_key_fields()
+    assert Model.get_primary_key_fields() == (Model.__ommi__.fields["id"],)
+
+
+def test_models_can_be_garbage_collected():
+    @ommi_model(collection=ModelCollection())
+    @dataclasses.dataclass
+    class Model:
+        id: int
+
+    Model.get_primary_key_fields()
+    model_ref = weakref.ref(Model)
+    del Model
+    gc.collect()
+
+    assert model_ref() is None
+
+
 def test_reference_fields():
     collection = ModelCollection()
 
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from typing import Annotated
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("motor")
+
+from ommi.ext.drivers.mongodb.add_action import MongoDBAddAction
+from ommi.ext.drivers.mongodb.delete_action import MongoDBDeleteAction
+from ommi.ext.drivers.mongodb.read_cache import MongoDBReadCache
+from ommi.ext.drivers.mongodb.set_fields_action import MongoDBSetFieldsAction
+from ommi.ext.drivers.mongodb.utils import process_ast
+from ommi.models import ommi_model
+from ommi.models.collections import ModelCollection
+from ommi.models.field_metadata import ReferenceTo
+from ommi.query_ast import when
+
+collection = ModelCollection()
+
+
+@ommi_model(collection=collection)
+@dataclass
+class CacheModelA:
+    id: int
+    name: str
+
+
+@ommi_model(collection=collection)
+@dataclass
+class CacheModelB:
+    id: int
+    a_id: Annotated[int, ReferenceTo(CacheModelA.id)]
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def create_database():
+    database = MagicMock()
+    database.__getitem__.return_value = AsyncMock()
+    return database
+
+
+async def load_joined(cache: MongoDBReadCache, loader: Loader):
+    return await cache.load(
+        "fetch", process_ast(when(CacheModelB, CacheModelA.name == "a")), loader
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("operation", ["fetch", "count"])
+async def test_repeated_reads_are_cached(operation):
+    cache, loader = MongoDBReadCache(), Loader()
+
+    first = await cache.load(operation, process_ast(when(CacheModelA.id == 1)), loader)
+    second = await cache.load(operation, process_ast(when(CacheModelA.id == 1)), loader)
+
+    assert first == second == 1
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_are_copies():
+    cache = MongoDBReadCache()
+
+    async def loader():
+        return [{"id": 1, "tags": ["a"]}]
+
+    first = await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+    first[0]["tags"].append("b")
+    second = await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+    second[0]["tags"].append("c")
+    third = await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+
+    assert first == [{"id": 1, "tags": ["a", "b"]}]
+    assert second == [{"id": 1, "tags": ["a", "c"]}]
+    assert third == [{"id": 1, "tags": ["a"]}]
+
+
+@pytest.mark.asyncio
+async def test_reads_with_different_values_are_not_shared():
+    cache, loader = MongoDBReadCache(), Loader()
+
+    await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+    await cache.load("fetch", process_ast(when(CacheModelA.id == 2)), loader)
+    await cache.load("fetch", process_ast(when(CacheModelA.id > 1)), loader)
+    await cache.load("count", process_ast(when(CacheModelA.id == 1)), loader)
+    await cache.load(
+        "fetch", process_ast(when(CacheModelA.id == 1).limit(1, 1)), loader
+    )
+
+    assert loader.calls == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model", [CacheModelA, CacheModelB])
+async def test_invalidate_drops_reads_using_collection(model):
+    cache, loader = MongoDBReadCache(), Loader()
+    await load_joined(cache, loader)
+
+    cache.invalidate(model.__ommi__.model_name)
+    await load_joined(cache, loader)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_keeps_unrelated_reads():
+    cache, loader = MongoDBReadCache(), Loader()
+    await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+
+    cache.invalidate(CacheModelB.__ommi__.model_name)
+    await cache.load("fetch", process_ast(when(CacheModelA.id == 1)), loader)
+
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda db, cache: MongoDBAddAction(None, db, None, cache).items(
+            CacheModelA(id=1, name="a")
+        ),
+        lambda db, cache: MongoDBSetFieldsAction(
+            None, (CacheModelA.id == 1,), db, None, cache
+        ).set_fields(name="b"),
+        lambda db, cache: MongoDBDeleteAction(
+            None, (CacheModelA.id == 1,), db, None, cache
+        ).delete(),
+        lambda db, cache: MongoDBAddAction(None, db, None, cache).items(
+            CacheModelB(id=1, a_id=1)
+        ),
+        lambda db, cache: MongoDBSetFieldsAction(
+            None, (CacheModelB.id == 1,), db, None, cache
+        ).set_fields(a_id=2),
+        lambda db, cache: MongoDBDeleteAction(
+            None, (CacheModelB.id == 1,), db, None, cache
+        ).delete(),
+    ],
+    ids=["add", "set", "delete", "add-joined", "set-joined", "delete-joined"],
+)
+async def test_writes_invalidate_reads(write):
+    cache, loader = MongoDBReadCache(), Loader()
+    await load_joined(cache, loader)
+
+    await write(create_database(), cache).raise_on_errors()
+    await load_joined(cache, loader)
+
+    assert loader.calls == 2
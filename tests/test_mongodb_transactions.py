@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import Annotated
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("motor")
+
+from ommi.ext.drivers.mongodb.add_action import MongoDBAddAction
+from ommi.ext.drivers.mongodb.set_fields_action import MongoDBSetFieldsAction
+from ommi.ext.drivers.mongodb.transactions import MongoDBTransaction
+from ommi.models import ommi_model
+from ommi.models.collections import ModelCollection
+from ommi.models.field_metadata import ReferenceTo
+
+collection = ModelCollection()
+
+
+@ommi_model(collection=collection)
+@dataclass
+class TransactionModelA:
+    name: str
+    id: int = None
+
+
+@ommi_model(collection=collection)
+@dataclass
+class TransactionModelB:
+    id: int
+    a_id: Annotated[int, ReferenceTo(TransactionModelA.id)]
+
+
+def create_database(*documents):
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=list(documents))
+
+    database = MagicMock()
+    database.__getitem__.return_value = documents_collection = AsyncMock()
+    documents_collection.aggregate = MagicMock(return_value=cursor)
+    return database, documents_collection
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("last, next_id", [(None, 0), ({"id": 4}, 5)])
+async def test_add_in_session_writes_next_key_with_document(last, next_id):
+    database, documents_collection = create_database()
+    documents_collection.find_one.return_value = last
+
+    item = TransactionModelA(name="a")
+    await MongoDBAddAction(None, database, session := MagicMock()).items(
+        item
+    ).raise_on_errors()
+
+    assert item.id == next_id
+    documents_collection.find_one.assert_awaited_once_with(
+        {"id": {"$ne": None}}, {"_id": 0, "id": 1}, sort=[("id", -1)], session=session
+    )
+    documents_collection.insert_one.assert_awaited_once_with(
+        {"name": "a", "id": next_id}, session=session
+    )
+    documents_collection.aggregate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_joined_update_in_session_updates_matched_ids():
+    database, documents_collection = create_database({"_id": 1}, {"_id": 2})
+
+    await MongoDBSetFieldsAction(
+        None,
+        (TransactionModelB, TransactionModelA.name == "a"),
+        database,
+        session := MagicMock(),
+    ).set_fields(a_id=3).raise_on_errors()
+
+    pipeline = documents_collection.aggregate.call_args.args[0]
+    assert all("$merge" not in stage for stage in pipeline)
+    documents_collection.update_many.assert_awaited_once_with(
+        {"_id": {"$in": [1, 2]}}, {"$set": {"a_id": 3}}, session=session
+    )
+
+
+def create_transaction():
+    session = MagicMock(in_transaction=True)
+    session.commit_transaction = AsyncMock(
+        side_effect=lambda: setattr(session, "in_transaction", False)
+    )
+    session.abort_transaction = AsyncMock(
+        side_effect=lambda: setattr(session, "in_transaction", False)
+    )
+
+    transaction = MongoDBTransaction(MagicMock())
+    transaction._session = session
+    return transaction
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("end", ["commit", "rollback"])
+async def test_queue_update_after_transaction_ends(end):
+    transaction = create_transaction()
+    await getattr(transaction, end)()
+
+    with pytest.raises(RuntimeError, match="committed or rolled back"):
+        transaction.queue_update(TransactionModelA.id == 1, name="b")
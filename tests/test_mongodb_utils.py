@@ -0,0 +1,253 @@
+import gc
+import weakref
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Annotated
+
+import pytest
+
+from ommi.ext.drivers.mongodb.utils import (
+    build_find_arguments,
+    build_pipeline,
+    process_ast,
+)
+from ommi.models import ommi_model
+from ommi.models.collections import ModelCollection
+from ommi.models.field_metadata import ReferenceTo, StoreAs
+from ommi.query_ast import when
+
+collection = ModelCollection()
+
+
+@ommi_model(collection=collection)
+@dataclass
+class UtilsModelA:
+    id: int
+    name: Annotated[str, StoreAs("username")]
+    age: int
+
+
+@ommi_model(collection=collection)
+@dataclass
+class UtilsModelB:
+    id: int
+    a_id: Annotated[int, ReferenceTo(UtilsModelA.id)]
+
+
+@pytest.mark.parametrize(
+    "ast, match",
+    [
+        (when(UtilsModelA.id == 1), [{"id": 1}]),
+        (when(UtilsModelA.id == 2), [{"id": 2}]),
+        (when(UtilsModelA.name == None), [{"username": None}]),
+        (when(UtilsModelA.name == "a"), [{"username": "a"}]),
+        (when(UtilsModelA.age > 10), [{"age": {"$gt": 10}}]),
+        (when(UtilsModelA.age > None), [{"age": {"$gt": None}}]),
+        (when(10 < UtilsModelA.age), [{"age": {"$gt": 10}}]),
+        (
+            when((UtilsModelA.id == 1).Or(UtilsModelA.age > 3), UtilsModelA.name == "x"),
+            [{"$or": [{"id": 1}, {"age": {"$gt": 3}}]}, {"username": "x"}],
+        ),
+        (
+            when((UtilsModelA.id == 5).Or(UtilsModelA.age > None), UtilsModelA.name == "y"),
+            [{"$or": [{"id": 5}, {"age": {"$gt": None}}]}, {"username": "y"}],
+        ),
+        (
+            when(
+                UtilsModelA.age > 1,
+                (UtilsModelA.name == "a").Or(
+                    (UtilsModelA.age < 5).And(UtilsModelA.id != 2)
+                ),
+            ),
+            [
+                {"age": {"$gt": 1}},
+                {
+                    "$or": [
+                        {"username": "a"},
+                        {"$and": [{"age": {"$lt": 5}}, {"id": {"$ne": 2}}]},
+                    ]
+                },
+            ],
+        ),
+        (
+            when(
+                UtilsModelA.age > 7,
+                (UtilsModelA.name == None).Or(
+                    (UtilsModelA.age < 9).And(UtilsModelA.id != 3)
+                ),
+            ),
+            [
+                {"age": {"$gt": 7}},
+                {
+                    "$or": [
+                        {"username": None},
+                        {"$and": [{"age": {"$lt": 9}}, {"id": {"$ne": 3}}]},
+                    ]
+                },
+            ],
+        ),
+        (
+            when(UtilsModelB, UtilsModelA.name == "x"),
+            [{"__join__UtilsModelA.username": "x"}],
+        ),
+        (
+            when(UtilsModelB, UtilsModelA.name == "z"),
+            [{"__join__UtilsModelA.username": "z"}],
+        ),
+    ],
+)
+def test_process_ast_match(ast, match):
+    assert process_ast(ast).match == match
+
+
+def test_same_shape_queries_fill_their_own_values():
+    queries = [process_ast(when(UtilsModelA.age > n, UtilsModelA.name == str(n))) for n in range(3)]
+
+    assert queries[0].shape == queries[1].shape == queries[2].shape
+    assert [q.match for q in queries] == [
+        [{"age": {"$gt": n}}, {"username": str(n)}] for n in range(3)
+    ]
+
+
+def test_unfilled_skeleton_is_not_mutated():
+    query = process_ast(when(UtilsModelB, UtilsModelA))
+    snapshot = deepcopy(query)
+    pipeline = deepcopy(build_pipeline(query))
+
+    assert process_ast(when(UtilsModelB, UtilsModelA)) is query
+
+    build_pipeline(query)[0].append({"$project": {"_id": 1}})
+    build_pipeline(query, hide_joins=False)[0].append({"$count": "count"})
+    build_find_arguments(query)[1]["limit"] = 10
+    process_ast(when(UtilsModelB, UtilsModelA.name == "x"))
+
+    assert query == snapshot
+    assert build_pipeline(query) == pipeline
+
+
+def test_queried_models_can_be_garbage_collected():
+    @ommi_model(collection=ModelCollection())
+    @dataclass
+    class Model:
+        id: int
+
+    process_ast(when(Model.id == 1))
+    model_ref = weakref.ref(Model)
+    del Model
+    gc.collect()
+
+    assert model_ref() is None
+
+
+def get_stage_names(pipeline):
+    return [next(iter(stage)) for stage in pipeline]
+
+
+def test_paging_limits_to_end_of_page_before_skipping():
+    pipeline, _ = build_pipeline(process_ast(when(UtilsModelA).limit(10, 2)))
+
+    assert pipeline == [{"$limit": 30}, {"$skip": 20}]
+
+
+def test_paging_many_to_one_join_before_lookups():
+    pipeline, _ = build_pipeline(
+        process_ast(when(UtilsModelB, UtilsModelA).limit(10, 1))
+    )
+
+    assert get_stage_names(pipeline) == [
+        "$limit",
+        "$skip",
+        "$lookup",
+        "$unwind",
+        "$project",
+    ]
+    assert pipeline[:2] == [{"$limit": 20}, {"$skip": 10}]
+
+
+@pytest.mark.parametrize(
+    "ast, stages",
+    [
+        (
+            when(UtilsModelA, UtilsModelB).limit(10, 1),
+            ["$lookup", "$unwind", "$limit", "$skip", "$project"],
+        ),
+        (
+            when(UtilsModelB, UtilsModelA.name == "x").limit(10, 1),
+            ["$lookup", "$unwind", "$match", "$limit", "$skip", "$project"],
+        ),
+    ],
+    ids=["one-to-many", "joined-filter"],
+)
+def test_paging_after_lookups(ast, stages):
+    pipeline, _ = build_pipeline(process_ast(ast))
+
+    assert get_stage_names(pipeline) == stages
+    assert {"$limit": 20} in pipeline and {"$skip": 10} in pipeline
+
+
+@pytest.mark.parametrize(
+    "ast, match",
+    [
+        (
+            when(UtilsModelA.age > 10, UtilsModelA.age < 20),
+            [{"age": {"$gt": 10, "$lt": 20}}],
+        ),
+        (
+            when(UtilsModelA.age > 1, UtilsModelA.name == "x", UtilsModelA.age <= 3),
+            [{"age": {"$gt": 1, "$lte": 3}}, {"username": "x"}],
+        ),
+        (
+            when(UtilsModelA.age > 1, UtilsModelA.age > 5),
+            [{"age": {"$gt": 1}}, {"age": {"$gt": 5}}],
+        ),
+        (
+            when(UtilsModelA.age == 5, UtilsModelA.age > 1),
+            [{"age": 5}, {"age": {"$gt": 1}}],
+        ),
+        (
+            when(UtilsModelA.age > 1, UtilsModelA.age == 5),
+            [{"age": {"$gt": 1}}, {"age": 5}],
+        ),
+        (
+            when(UtilsModelA.age > 0, (UtilsModelA.age > 1).And(UtilsModelA.age < 5)),
+            [
+                {"age": {"$gt": 0}},
+                {"$and": [{"age": {"$gt": 1}}, {"age": {"$lt": 5}}]},
+            ],
+        ),
+        (
+            when(
+                UtilsModelA.age > 0,
+                (UtilsModelA.id == 1).Or((UtilsModelA.age > 1).And(UtilsModelA.age < 5)),
+            ),
+            [
+                {"age": {"$gt": 0}},
+                {
+                    "$or": [
+                        {"id": 1},
+                        {"$and": [{"age": {"$gt": 1}}, {"age": {"$lt": 5}}]},
+                    ]
+                },
+            ],
+        ),
+    ],
+    ids=[
+        "range",
+        "range-around-other-field",
+        "same-operator",
+        "equality-first",
+        "equality-last",
+        "nested-and",
+        "nested-or",
+    ],
+)
+def test_merge_field_operators(ast, match):
+    assert process_ast(ast).match == match
+
+
+def test_merged_operators_keep_their_own_values():
+    first = process_ast(when(UtilsModelA.age > 10, UtilsModelA.age < 20))
+    second = process_ast(when(UtilsModelA.age > 30, UtilsModelA.age < 40))
+
+    assert first.match == [{"age": {"$gt": 10, "$lt": 20}}]
+    assert second.match == [{"age": {"$gt": 30, "$lt": 40}}]
@@ -0,0 +1,168 @@
+import gc
+import weakref
+from dataclasses import dataclass
+from typing import Annotated
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("psycopg")
+
+from ommi.ext.drivers.postgresql.add_action import PostgreSQLAddAction
+from ommi.ext.drivers.postgresql.count_action import PostgreSQLCountAction
+from ommi.ext.drivers.postgresql.delete_action import PostgreSQLDeleteAction
+from ommi.ext.drivers.postgresql.fetch_action import PostgreSQLFetchAction
+from ommi.ext.drivers.postgresql.set_fields_action import PostgreSQLSetFieldsAction
+from ommi.ext.drivers.postgresql.utils import build_query
+from ommi.models import ommi_model
+from ommi.models.collections import ModelCollection
+from ommi.models.field_metadata import ReferenceTo, StoreAs
+from ommi.query_ast import when
+
+collection = ModelCollection()
+
+
+@ommi_model(collection=collection)
+@dataclass
+class QueryModelA:
+    id: int
+    name: Annotated[str, StoreAs("username")]
+
+
+@ommi_model(collection=collection)
+@dataclass
+class QueryModelB:
+    id: int
+    a_id: Annotated[int, ReferenceTo(QueryModelA.id)]
+
+
+def test_same_shape_queries_keep_their_own_values():
+    first = build_query(when(QueryModelA.id == 1, QueryModelA.name == "a"))
+    second = build_query(when(QueryModelA.id == 2, QueryModelA.name == "b"))
+
+    assert first.where == second.where == (
+        "QueryModelA.id = %s AND QueryModelA.username = %s"
+    )
+    assert first.values == [1, "a"]
+    assert second.values == [2, "b"]
+    assert first.statements is second.statements
+
+
+def test_same_shape_queries_keep_their_own_paging():
+    first = build_query(when(QueryModelB, QueryModelA.name == "a").limit(10, 1))
+    second = build_query(when(QueryModelB, QueryModelA.name == "b").limit(5))
+
+    assert first.models == second.models == [QueryModelA]
+    assert (first.limit, first.offset, first.values) == (10, 10, ["a"])
+    assert (second.limit, second.offset, second.values) == (5, 0, ["b"])
+
+
+def test_queried_models_can_be_garbage_collected():
+    @ommi_model(collection=ModelCollection())
+    @dataclass
+    class Model:
+        id: int
+
+    build_query(when(Model.id == 1))
+    model_ref = weakref.ref(Model)
+    del Model
+    gc.collect()
+
+    assert model_ref() is None
+
+
+@pytest.mark.parametrize(
+    "ast, where",
+    [
+        (when(QueryModelA.id == 1), "QueryModelA.id = %s"),
+        (when(QueryModelA.id != 1), "QueryModelA.id != %s"),
+        (when(QueryModelA.id > 1), "QueryModelA.id > %s"),
+        (when(QueryModelA.id >= 1), "QueryModelA.id >= %s"),
+        (when(QueryModelA.id < 1), "QueryModelA.id < %s"),
+        (when(QueryModelA.id <= 1), "QueryModelA.id <= %s"),
+    ],
+)
+def test_operators_on_the_same_field_build_their_own_where(ast, where):
+    query = build_query(ast)
+
+    assert query.where == where
+    assert query.values == [1]
+
+
+def test_operators_on_the_same_field_have_their_own_statements():
+    queries = [
+        build_query(when(QueryModelA.id == 1)),
+        build_query(when(QueryModelA.id > 1)),
+        build_query(when(QueryModelA.id < 1)),
+    ]
+
+    assert len({id(query.statements) for query in queries}) == len(queries)
+
+
+@pytest.mark.asyncio
+async def test_statement_keys():
+    def ast(value):
+        return when(QueryModelB, QueryModelA.name == value).limit(10, 1)
+
+    query = build_query(ast("a"))
+    fetch = PostgreSQLFetchAction(None, ())._build_select_query(query)
+    count = PostgreSQLCountAction(None, ())._build_count_query(query)
+
+    session = AsyncMock()
+    await PostgreSQLDeleteAction(None, ())._delete(ast("b"), session)
+    session.execute.assert_awaited_with(
+        b"DELETE FROM QueryModelB USING QueryModelA "
+        b"WHERE (QueryModelA.username = %s) AND (QueryModelA.id = QueryModelB.a_id);",
+        ["b"],
+    )
+
+    await PostgreSQLSetFieldsAction(None, ())._update(ast("c"), {"a_id": 2}, session)
+    session.execute.assert_awaited_with(
+        b"UPDATE QueryModelB SET a_id = %s FROM QueryModelA "
+        b"WHERE QueryModelA.id = QueryModelB.a_id AND (QueryModelA.username = %s);",
+        (2, "c"),
+    )
+
+    assert fetch == (
+        b"SELECT QueryModelB.id, QueryModelB.a_id FROM QueryModelB "
+        b"JOIN QueryModelA ON QueryModelA.id = QueryModelB.a_id "
+        b"WHERE QueryModelA.username = %s LIMIT %s OFFSET %s;"
+    )
+    assert count == (
+        b"SELECT Count(*) FROM QueryModelB "
+        b"JOIN QueryModelA ON QueryModelA.id = QueryModelB.a_id "
+        b"WHERE QueryModelA.username = %s LIMIT %s OFFSET %s;"
+    )
+    assert query.statements == {
+        ("select", True, True): fetch,
+        ("count", True, True): count,
+        ("delete", False): session.execute.await_args_list[0].args[0],
+        ("update", "a_id"): session.execute.await_args_list[1].args[0],
+    }
+    assert build_query(ast("d")).statements is query.statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "allow_truncate, statement",
+    [
+        (False, b"DELETE FROM QueryModelA;"),
+        (True, b"TRUNCATE TABLE QueryModelA;"),
+    ],
+)
+async def test_unfiltered_delete(allow_truncate, statement):
+    session = AsyncMock()
+    action = PostgreSQLDeleteAction(None, (QueryModelA,), allow_truncate)
+    await action._delete(when(QueryModelA), session)
+
+    session.execute.assert_awaited_once_with(statement, [])
+
+
+def test_unnest_statement_keeps_row_order():
+    statement = PostgreSQLAddAction._get_unnest_statement(QueryModelA, (False,))
+
+    assert statement == (
+        b"INSERT INTO QueryModelA (username) "
+        b"SELECT c0 FROM UNNEST(%s::TEXT[]) WITH ORDINALITY AS u(c0, ordinality) "
+        b"ORDER BY ordinality RETURNING id;"
+    )